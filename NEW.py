@@ -2,10 +2,48 @@ import pygame
 import sys
 import random
 import os
+import time
+import json
+import heapq
+import bisect
+import atexit
+import threading
+import signal
+import cProfile
+import pstats
+import io
+import zlib
+import math
+import sqlite3
+import stat
+import socketserver
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Callable
+
+try:
+    import numpy as np
+except ImportError:  # only particles need it, they switch off without it
+    np = None
+
+try:
+    import resource
+except ImportError:  # not on Windows; memory stats fall back to /proc or nothing
+    resource = None
+
+try:
+    from pygame._sdl2.video import Window as SDLWindow, Renderer as SDLRenderer, Texture
+except ImportError:  # builds without _sdl2 only get the surface backend
+    SDLRenderer = None
 
 # --------------------- init ---------------------
+# `python NEW.py --spawns ...` only dumps data: no window, no audio device, no art
+OFFLINE = __name__ == "__main__" and sys.argv[1:2] == ["--spawns"]
+if OFFLINE:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
 pygame.init()
 pygame.mixer.init()
 pygame.display.set_caption("Polutio")
@@ -13,19 +51,173 @@ pygame.display.set_caption("Polutio")
 # Virtual game resolution
 VIRTUAL_W, VIRTUAL_H = 1920, 1080
 TOP_BAR_H = 96
+QUIT_BTN_RECT = pygame.Rect(VIRTUAL_W - 160, VIRTUAL_H - 64, 136, 44)
+# where each HUD piece draws, see RenderQueue.submit_call
+TOP_BAR_RECT = pygame.Rect(0, 0, VIRTUAL_W, TOP_BAR_H)
+FOOTER_RECT = pygame.Rect(0, VIRTUAL_H - 72, VIRTUAL_W, 72)
+PAUSED_RECT = pygame.Rect(VIRTUAL_W // 2 - 300, VIRTUAL_H // 2 - 80, 600, 160)
+GRAVITY = 1400.0  # px/s^2 for thrown items, sliced halves and particles
+
+# Frame pacing: sleep | busy | hybrid | vsync, and a target rate ("auto" follows the display)
+PACER_MODE = os.environ.get("POLUTIO_PACER", "hybrid")
+PACER_FPS = os.environ.get("POLUTIO_FPS", "auto")
+VSYNC_ACTIVE = False
+
+# Presentation: "surface" (software blits + smoothscale), "texture" (SDL2 Renderer/Texture)
+# or "texture-software" (same, forced onto SDL's software renderer for machines without a GPU)
+RENDER_BACKEND = os.environ.get("POLUTIO_RENDERER", "surface")
+USE_TEXTURES = RENDER_BACKEND.startswith("texture") and SDLRenderer is not None and not OFFLINE
+if RENDER_BACKEND == "texture-software": os.environ["SDL_RENDER_DRIVER"] = "software"
+
+def set_display_mode(size, flags=0):
+    global VSYNC_ACTIVE
+    if PACER_MODE == "vsync":
+        try:
+            # SDL only honours vsync on renderer-backed windows, hence SCALED
+            surf = pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+            VSYNC_ACTIVE = True
+            return surf
+        except pygame.error:
+            pass
+    VSYNC_ACTIVE = False
+    return pygame.display.set_mode(size, flags)
 
 # Real screen in fullscreen
 def make_fullscreen():
+    if OFFLINE: return pygame.display.set_mode((1, 1))  # convert() still needs a display format
+    if USE_TEXTURES:
+        # SCALED makes pygame own a renderer at the virtual size, which the texture backend draws with
+        return set_display_mode((VIRTUAL_W, VIRTUAL_H), pygame.FULLSCREEN | pygame.SCALED)
     info = pygame.display.Info()
-    return pygame.display.set_mode((info.current_w, info.current_h), pygame.FULLSCREEN)
+    return set_display_mode((info.current_w, info.current_h), pygame.FULLSCREEN)
 
 SCREEN = make_fullscreen()
 SCREEN_W, SCREEN_H = SCREEN.get_size()
 
-# We render everything to this surface, then scale to the real screen
-GAME_SURF = pygame.Surface((VIRTUAL_W, VIRTUAL_H)).convert_alpha()
-CLOCK = pygame.time.Clock()
-FPS = 60
+def make_renderer():
+    if not USE_TEXTURES: return None
+    try:
+        renderer = SDLRenderer.from_window(SDLWindow.from_display_module())
+        renderer.logical_size = (VIRTUAL_W, VIRTUAL_H)  # SDL does the scaling/letterboxing
+        return renderer
+    except pygame.error:
+        return None
+
+RENDERER = make_renderer()  # None means the surface backend
+
+# Split screen: independent play sessions side by side in one window (1 = the normal game)
+SESSIONS = max(1, min(4, int(os.environ.get("POLUTIO_SESSIONS", "1"))))
+
+# We render everything to this surface, then scale to the real screen.
+# Every screen paints a full background first, so it can be opaque (cheaper blits, no clear).
+def make_render_target():
+    # with textures this only holds the non-sprite layers, uploaded as a transparent overlay;
+    # split seats draw at their own size and only use it for HUD pieces and menu screens
+    if RENDERER is not None or SESSIONS > 1:
+        return pygame.Surface((VIRTUAL_W, VIRTUAL_H), pygame.SRCALPHA).convert_alpha()
+    return make_opaque_surface((VIRTUAL_W, VIRTUAL_H))
+
+def make_opaque_surface(size) -> pygame.Surface:
+    surf = pygame.Surface(size).convert()
+    if surf.get_bitsize() != 32:  # smoothscale needs 24/32 bit, the particle scatter (pixels2d) 32
+        surf = pygame.Surface(size, 0, 32)
+    return surf
+
+GAME_SURF = make_render_target()
+FPS = 60  # used when the display can't report its refresh rate
+
+# Idle throttling: static screens only redraw on input, unfocused windows tick slowly
+IDLE_STATES = {"MAIN_MENU", "LEVEL_SELECT", "GAME_OVER", "LEADERBOARD"}
+IDLE_WAIT_MS = 500
+BACKGROUND_FPS = 10
+
+# --------------------- frame pacing ---------------------
+PACER_SPIN_S = 0.002      # hybrid: sleep until this close to the deadline, then spin
+PACER_HISTORY = 240       # frame intervals kept for jitter stats
+PACER_MISS_FACTOR = 1.5   # an interval this many periods long counts as a missed deadline
+
+def display_refresh_rate(default: int = FPS) -> int:
+    # pygame-ce exposes the refresh rate, classic pygame doesn't
+    try:
+        if hasattr(pygame.display, "get_current_refresh_rate"):
+            rate = pygame.display.get_current_refresh_rate()
+        elif hasattr(pygame.display, "get_desktop_refresh_rates"):
+            rate = pygame.display.get_desktop_refresh_rates()[0]
+        else:
+            rate = 0
+    except (pygame.error, IndexError):
+        rate = 0
+    return rate if rate and rate > 0 else default
+
+def target_fps() -> int:
+    if PACER_FPS == "auto": return display_refresh_rate()
+    try: return max(1, int(PACER_FPS))
+    except ValueError: return FPS
+
+# Deadline-based frame pacing. Deadlines advance by exactly one period, so sleep
+# overshoot doesn't accumulate; a frame more than a period late resyncs instead.
+class FramePacer:
+    def __init__(self, mode: str = PACER_MODE, fps: Optional[int] = None):
+        if mode == "vsync" and not VSYNC_ACTIVE: mode = "hybrid"  # flip won't block for us
+        self.mode = mode
+        self.set_fps(fps or target_fps())
+        self.intervals = deque(maxlen=PACER_HISTORY)
+        self.frames = 0
+        self.missed = 0
+        self.resync()
+
+    def set_fps(self, fps: int):
+        self.fps = fps
+        self.period = 1.0 / fps
+
+    # forget the last frame, e.g. after blocking on input, so it isn't counted as a miss
+    def resync(self):
+        self.last = time.perf_counter()
+        self.deadline = self.last + self.period
+
+    def _wait_until(self, deadline: float, mode: str):
+        now = time.perf_counter()
+        if mode == "busy":
+            while now < deadline: now = time.perf_counter()
+            return
+        remaining = deadline - now
+        if mode == "hybrid": remaining -= PACER_SPIN_S
+        if remaining > 0: time.sleep(remaining)
+        if mode == "hybrid":
+            while time.perf_counter() < deadline: pass
+
+    # blocks until the next frame is due and returns dt in seconds
+    def wait(self, fps: Optional[int] = None) -> float:
+        if fps is not None and fps != self.fps:
+            # throttled (background) frames: plain sleep, kept out of the stats
+            self._wait_until(self.last + 1.0 / fps, "sleep")
+            now = time.perf_counter()
+            dt, self.last = now - self.last, now
+            self.deadline = now + self.period
+            return dt
+        if self.mode != "vsync":
+            self._wait_until(self.deadline, self.mode)
+        now = time.perf_counter()
+        dt = now - self.last
+        self.last = now
+        self.deadline += self.period
+        if now - self.deadline > self.period: self.deadline = now + self.period
+        self.frames += 1
+        self.intervals.append(dt)
+        if dt > self.period * PACER_MISS_FACTOR: self.missed += 1
+        return dt
+
+    def stats(self) -> dict:
+        iv = sorted(self.intervals)
+        if not iv: return {"mode": self.mode, "fps": self.fps, "frames": 0, "missed": 0}
+        n = len(iv)
+        mean = sum(iv) / n
+        jitter = (sum((x - mean) ** 2 for x in iv) / n) ** 0.5
+        return {
+            "mode": self.mode, "fps": self.fps, "frames": self.frames, "missed": self.missed,
+            "mean_ms": mean * 1000, "jitter_ms": jitter * 1000,
+            "p99_ms": iv[min(n - 1, int(n * 0.99))] * 1000, "max_ms": iv[-1] * 1000,
+        }
 
 # --------------------- fonts ---------------------
 def font(size): return pygame.font.SysFont(None, size)
@@ -59,19 +251,53 @@ PU_DOUBLE_PCT = "double percentage"
 PU_MAGNET = "magnet"
 PU_STOPWATCH = "stop watch"
 
-INSTANT_PUS = {PU_MORE_TIME, PU_LESS_TIME, PU_LESS_PCT, PU_MORE_PCT}
-TIMED_PUS = {PU_BIGGER_BASKET, PU_DOUBLE_PCT, PU_MAGNET, PU_STOPWATCH}
+STACK_REFRESH = "refresh"  # picking it up while active restarts the full duration
+STACK_EXTEND = "extend"    # picking it up while active adds the duration on top
+INSTANT_BADGE_S = 1.0      # instant effects still show their badge this long
 
-POWERUP_ICONS: Dict[str, str] = {
-    PU_MORE_TIME:      "pu_more_time.png",
-    PU_LESS_TIME:      "pu_less_time.png",
-    PU_BIGGER_BASKET:  "pu_bigger_basket.png",
-    PU_LESS_PCT:       "pu_less_pct.png",
-    PU_MORE_PCT:       "pu_more_pct.png",
-    PU_DOUBLE_PCT:     "pu_double_pct.png",
-    PU_MAGNET:         "pu_magnet.png",
-    PU_STOPWATCH:      "pu_stopwatch.png",
-}
+@dataclass
+class PowerUpDef:
+    kind: str
+    icon: str
+    color: Tuple[int, int, int]        # fallback fill when the icon is missing
+    label: str                         # fallback text on the falling drop
+    badge: str                         # fallback text on the top bar badge
+    apply: Callable[["Game"], None]
+    expire: Optional[Callable[["Game"], None]] = None  # None means an instant effect
+    duration_s: Optional[float] = None                 # None uses the level's powerup_duration_s
+    stacking: str = STACK_REFRESH
+    weight: float = 1.0                                # relative spawn chance
+
+    @property
+    def timed(self) -> bool: return self.expire is not None
+
+POWERUPS: Dict[str, PowerUpDef] = {}
+
+def register_powerup(pu: PowerUpDef) -> PowerUpDef:
+    POWERUPS[pu.kind] = pu
+    return pu
+
+def _pu_more_time(g): g.time_left += 5.0
+def _pu_less_time(g): g.time_left = max(0.0, g.time_left - 5.0)
+def _pu_less_pct(g): g.progress = max(0, g.progress - 2)
+def _pu_more_pct(g): g.progress = min(100, g.progress + 5)
+def _pu_big_on(g): g.girl.set_big_model(True)
+def _pu_big_off(g): g.girl.set_big_model(False)
+def _pu_double_on(g): g.double_gain = True
+def _pu_double_off(g): g.double_gain = False
+def _pu_magnet_on(g): g.magnet = True
+def _pu_magnet_off(g): g.magnet = False
+def _pu_slowmo_on(g): g.world_clock.set("slowmo", g.level.slowmo_factor)
+def _pu_slowmo_off(g): g.world_clock.set("slowmo", 1.0)
+
+register_powerup(PowerUpDef(PU_MORE_TIME, "pu_more_time.png", GREEN, "+5s", "+5s", _pu_more_time))
+register_powerup(PowerUpDef(PU_LESS_TIME, "pu_less_time.png", RED, "-5s", "-5s", _pu_less_time))
+register_powerup(PowerUpDef(PU_BIGGER_BASKET, "pu_bigger_basket.png", GOLD, "B", "B", _pu_big_on, _pu_big_off))
+register_powerup(PowerUpDef(PU_LESS_PCT, "pu_less_pct.png", MAGENTA, "-2%", "-2", _pu_less_pct))
+register_powerup(PowerUpDef(PU_MORE_PCT, "pu_more_pct.png", CYAN, "+5%", "+5", _pu_more_pct))
+register_powerup(PowerUpDef(PU_DOUBLE_PCT, "pu_double_pct.png", ORANGE, "x2", "x2", _pu_double_on, _pu_double_off, duration_s=5.0))
+register_powerup(PowerUpDef(PU_MAGNET, "pu_magnet.png", (100, 200, 255), "M", "M", _pu_magnet_on, _pu_magnet_off))
+register_powerup(PowerUpDef(PU_STOPWATCH, "pu_stopwatch.png", PURPLE, "S", "S", _pu_slowmo_on, _pu_slowmo_off))
 
 # Printer image file, drawn below the top bar
 PRINTER_IMAGE = "printer.png"
@@ -82,12 +308,33 @@ GOOD_ITEM_FILES = ["good1.png", "good2.png", "good3.png", "good4.png", "good5.pn
 BAD_ITEM_FILES  = ["bad1.png",  "bad2.png",  "bad3.png",  "bad4.png",  "bad5.png"]
 
 
+# sprites with at least this fraction of fully transparent pixels get RLE-accelerated blits
+RLE_MIN_TRANSPARENT = 0.25
+# alpha counted as opaque: smoothscale tops out at 253 when it shrinks an opaque image
+OPAQUE_MIN_ALPHA = 250
+
+def optimize_surface(img: pygame.Surface) -> pygame.Surface:
+    # pick the cheapest blit path: opaque display format, RLE alpha, or plain per-pixel alpha
+    w, h = img.get_size()
+    if w == 0 or h == 0: return img
+    if pygame.mask.from_surface(img, OPAQUE_MIN_ALPHA - 1).count() == w * h:
+        return img.convert()
+    visible = pygame.mask.from_surface(img, 0).count()  # alpha > 0
+    if 1.0 - visible / float(w * h) >= RLE_MIN_TRANSPARENT:
+        img.set_alpha(255, pygame.RLEACCEL)
+    return img
+
 _ITEM_IMG_CACHE: Dict[Tuple[str, Tuple[int,int]], Optional[pygame.Surface]] = {}
 
+# [hits, misses] per asset cache, for the live stats
+CACHE_STATS: Dict[str, List[int]] = {"item_images": [0, 0], "fallbacks": [0, 0], "textures": [0, 0]}
+
 def get_item_image(path: str, size: Tuple[int, int]) -> Optional[pygame.Surface]:
     key = (path, size)
     if key in _ITEM_IMG_CACHE:
+        CACHE_STATS["item_images"][0] += 1
         return _ITEM_IMG_CACHE[key]
+    CACHE_STATS["item_images"][1] += 1
     if not path or not os.path.isfile(path):
         _ITEM_IMG_CACHE[key] = None
         return None
@@ -95,6 +342,7 @@ def get_item_image(path: str, size: Tuple[int, int]) -> Optional[pygame.Surface]
         img = pygame.image.load(path).convert_alpha()
         if size:
             img = pygame.transform.smoothscale(img, size)
+        img = optimize_surface(img)
         _ITEM_IMG_CACHE[key] = img
         return img
     except:
@@ -102,6 +350,29 @@ def get_item_image(path: str, size: Tuple[int, int]) -> Optional[pygame.Surface]
         return None
 
 # --------------------- utils ---------------------
+# Continuous AABB test on plain floats: box A moves by (dx, dy) during the frame,
+# box B holds still (pass motion relative to B). True if they overlap at any point.
+def swept_aabb_overlap(ax, ay, aw, ah, dx, dy, bx, by, bw, bh) -> bool:
+    t0, t1 = 0.0, 1.0
+    if dx == 0:
+        if ax + aw <= bx or ax >= bx + bw: return False
+    else:
+        ta = (bx - ax - aw) / dx
+        tb = (bx + bw - ax) / dx
+        if ta > tb: ta, tb = tb, ta
+        if ta > t0: t0 = ta
+        if tb < t1: t1 = tb
+        if t0 >= t1: return False
+    if dy == 0:
+        if ay + ah <= by or ay >= by + bh: return False
+    else:
+        ta = (by - ay - ah) / dy
+        tb = (by + bh - ay) / dy
+        if ta > tb: ta, tb = tb, ta
+        if ta > t0: t0 = ta
+        if tb < t1: t1 = tb
+    return t0 < t1
+
 def draw_text_center(text, font_obj, color, surf, cx, cy):
     img = font_obj.render(text, True, color)
     surf.blit(img, img.get_rect(center=(cx, cy)))
@@ -111,13 +382,13 @@ def load_image(path: str, size: Optional[Tuple[int, int]] = None) -> Optional[py
     try:
         img = pygame.image.load(path).convert_alpha()
         if size: img = pygame.transform.smoothscale(img, size)
-        return img
+        return optimize_surface(img)
     except:
         return None
 
 # main menu background
 MAIN_MENU_BG = "menu_bg.png"  # drop a 1920x1080 png next to the script
-MAIN_MENU_BG_IMG = load_image(MAIN_MENU_BG, (VIRTUAL_W, VIRTUAL_H))
+MAIN_MENU_BG_IMG = None if OFFLINE else load_image(MAIN_MENU_BG, (VIRTUAL_W, VIRTUAL_H))
 
 def safe_music_load_and_play(path: Optional[str]):
     try:
@@ -129,12 +400,467 @@ def safe_music_load_and_play(path: Optional[str]):
     except:
         pygame.mixer.music.stop()
 
-def mouse_pos_virtual():
-    mx, my = pygame.mouse.get_pos()
+def screen_to_virtual(mx, my):
     vx = int(mx * VIRTUAL_W / SCREEN_W)
     vy = int(my * VIRTUAL_H / SCREEN_H)
     return vx, vy
 
+def mouse_pos_virtual():
+    return screen_to_virtual(*pygame.mouse.get_pos())
+
+# --------------------- swipe input ---------------------
+SWIPE_MAX_SAMPLES = 96     # hard cap on trail points kept for slicing
+SWIPE_MIN_DIST = 6.0       # drop samples closer than this to the last one (0 = keep all)
+SLICE_TRAIL_S = 0.18       # how long a trail point stays sliceable
+
+# Collects every mouse/finger motion sample between frames. Events arrive in one
+# batch per frame, so samples get timestamps spread evenly since the last drain.
+class SwipeCapture:
+    def __init__(self, max_samples: int = SWIPE_MAX_SAMPLES, min_dist: float = SWIPE_MIN_DIST,
+                 to_local: Optional[Callable] = None):
+        self.min_dist2 = min_dist * min_dist
+        self.to_local = to_local or (lambda pos: pos)  # frame -> session coordinates in split screen
+        self.pending = deque(maxlen=max_samples)
+        self.pressed = False
+        self.finger_id = None
+        self.new_stroke = False
+        self.last_drain_t = pygame.time.get_ticks() / 1000.0
+
+    def reset(self):
+        self.pending.clear()
+        self.pressed = False
+        self.finger_id = None
+        self.new_stroke = False
+        self.last_drain_t = pygame.time.get_ticks() / 1000.0
+
+    def _add(self, pos):
+        if self.pending and self.min_dist2 > 0:
+            lx, ly = self.pending[-1]
+            if (pos[0] - lx)**2 + (pos[1] - ly)**2 < self.min_dist2: return
+        self.pending.append(pos)
+
+    def _begin(self, pos) -> bool:
+        if not (0 <= pos[0] < VIRTUAL_W and 0 <= pos[1] < VIRTUAL_H): return False  # another viewport's stroke
+        self.pressed = True
+        self.new_stroke = True
+        self.pending.clear()
+        self.pending.append(pos)
+        return True
+
+    def handle_event(self, e):
+        # SDL also synthesizes mouse events from touches, those are taken from the finger events
+        if e.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION) and getattr(e, "touch", False):
+            return
+        local = self.to_local
+        if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+            self._begin(local(screen_to_virtual(*e.pos)))
+        elif e.type == pygame.MOUSEBUTTONUP and e.button == 1:
+            if self.pressed: self._add(local(screen_to_virtual(*e.pos)))
+            self.pressed = False
+        elif e.type == pygame.MOUSEMOTION:
+            if e.buttons[0]:
+                if not self.pressed: self._begin(local(screen_to_virtual(*e.pos)))
+                else: self._add(local(screen_to_virtual(*e.pos)))
+        elif e.type == pygame.FINGERDOWN and self.finger_id is None:
+            if self._begin(local((int(e.x * VIRTUAL_W), int(e.y * VIRTUAL_H)))): self.finger_id = e.finger_id
+        elif e.type == pygame.FINGERMOTION and e.finger_id == self.finger_id:
+            self._add(local((int(e.x * VIRTUAL_W), int(e.y * VIRTUAL_H))))
+        elif e.type == pygame.FINGERUP and e.finger_id == self.finger_id:
+            self._add(local((int(e.x * VIRTUAL_W), int(e.y * VIRTUAL_H))))
+            self.finger_id = None
+            self.pressed = False
+
+    # -> (new_stroke, [(x, y, t), ...]) for everything seen since the last drain
+    def drain(self):
+        now = pygame.time.get_ticks() / 1000.0
+        n = len(self.pending)
+        span = min(now - self.last_drain_t, 0.1)  # a long stall should not age the whole batch out
+        samples = [(x, y, now - span + span * (i + 1) / n) for i, (x, y) in enumerate(self.pending)]
+        self.pending.clear()
+        new_stroke, self.new_stroke = self.new_stroke, False
+        self.last_drain_t = now
+        return new_stroke, samples
+
+# --------------------- telemetry ---------------------
+TELEMETRY_ENABLED = os.environ.get("POLUTIO_TELEMETRY", "0") == "1"
+TELEMETRY_DIR = os.environ.get("POLUTIO_TELEMETRY_DIR", "telemetry")
+TELEMETRY_RING = 8192                 # events held in memory, oldest dropped when full
+TELEMETRY_FLUSH_S = 1.0               # writer batches at most this often
+TELEMETRY_MAX_BYTES = 8 * 1024 * 1024 # rotate to a new file past this size
+TELEMETRY_KEEP_FILES = 10
+
+# The game thread only appends tuples to a bounded deque; a daemon thread turns
+# them into JSONL and does all file I/O, so the loop never waits on disk.
+class Telemetry:
+    def __init__(self, enabled: bool = TELEMETRY_ENABLED, out_dir: str = TELEMETRY_DIR):
+        self.enabled = enabled
+        self.out_dir = out_dir
+        self.ring = deque(maxlen=TELEMETRY_RING)
+        self.emitted = 0
+        self.dropped = 0       # overwritten in the ring before the writer got to them
+        self.written = 0
+        self.write_errors = 0
+        self.emit_s = 0.0      # game-thread time spent in event(), i.e. the in-loop cost
+        self.write_s = 0.0     # writer-thread time spent encoding and writing
+        self._seq = 0
+        self._stop = False
+        self._wake = threading.Event()
+        self._thread = None
+        if enabled:
+            self._thread = threading.Thread(target=self._writer, name="telemetry", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def event(self, ev: str, /, **data):
+        if not self.enabled: return
+        t0 = time.perf_counter()
+        ring = self.ring
+        if len(ring) == ring.maxlen: self.dropped += 1
+        ring.append((time.time(), ev, data))
+        self.emitted += 1
+        self.emit_s += time.perf_counter() - t0
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled, "emitted": self.emitted, "dropped": self.dropped,
+            "written": self.written, "write_errors": self.write_errors, "queued": len(self.ring),
+            "emit_us_avg": 1e6 * self.emit_s / max(1, self.emitted), "write_s": self.write_s,
+        }
+
+    def close(self):
+        if self._thread is None: return
+        self._stop = True
+        self._wake.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def _open_next(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        names = sorted(n for n in os.listdir(self.out_dir) if n.startswith("polutio-") and n.endswith(".jsonl"))
+        for old in names[:max(0, len(names) - TELEMETRY_KEEP_FILES + 1)]:
+            try: os.remove(os.path.join(self.out_dir, old))
+            except OSError: pass
+        name = time.strftime("polutio-%Y%m%d-%H%M%S") + f"-{self._seq:03d}.jsonl"
+        self._seq += 1
+        return open(os.path.join(self.out_dir, name), "a", encoding="utf-8")
+
+    def _writer(self):
+        f, size = None, 0
+        while True:
+            self._wake.wait(TELEMETRY_FLUSH_S)
+            self._wake.clear()
+            stop = self._stop
+            batch = []
+            try:
+                while True: batch.append(self.ring.popleft())
+            except IndexError:
+                pass
+            if batch:
+                t0 = time.perf_counter()
+                lines = "".join(json.dumps({"t": round(t, 4), "ev": ev, **data}, separators=(",", ":")) + "\n"
+                                for t, ev, data in batch)
+                try:
+                    if f is None or size >= TELEMETRY_MAX_BYTES:
+                        if f: f.close()
+                        f, size = self._open_next(), 0
+                    f.write(lines)
+                    f.flush()
+                    size += len(lines)
+                    self.written += len(batch)
+                except OSError:
+                    self.write_errors += 1
+                    f = None
+                self.write_s += time.perf_counter() - t0
+            if stop: break
+        if f: f.close()
+
+# --------------------- live stats ---------------------
+# "" = off, "PORT" or "HOST:PORT" = HTTP (localhost unless a host is given), "unix:/path" = UNIX socket
+STATS_ADDR = os.environ.get("POLUTIO_STATS", "")
+STATS_PUBLISH_S = 0.5
+
+def memory_usage() -> dict:
+    out = {}
+    try:
+        with open("/proc/self/statm") as f:
+            out["rss_bytes"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        out["peak_rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB elsewhere
+    return out
+
+def _flatten(d: dict, prefix: str = "") -> List[str]:
+    lines = []
+    for k, v in d.items():
+        if isinstance(v, dict): lines += _flatten(v, f"{prefix}{k}.")
+        else: lines.append(f"{prefix}{k} {v}")
+    return lines
+
+class _StatsHTTPHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        snap = self.server.owner.latest
+        if self.path.split("?")[0] in ("/", "/stats"):
+            body, ctype = json.dumps(snap).encode(), "application/json"
+        elif self.path.split("?")[0] == "/stats.txt":
+            body, ctype = ("\n".join(_flatten(snap)) + "\n").encode(), "text/plain"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args): pass
+
+# UNIX socket: every connection just gets the latest snapshot as one JSON line
+class _StatsStreamHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.wfile.write(json.dumps(self.server.owner.latest).encode() + b"\n")
+
+# The main loop builds a fresh dict and swaps the reference in; server threads only
+# ever read whole, never-mutated snapshots, so there is no lock for the game to wait on.
+class StatsServer:
+    def __init__(self, addr: str = STATS_ADDR):
+        self.addr = addr
+        self.latest: dict = {}
+        self.server = None
+        self.unix_path = None
+        if not addr: return
+        try:
+            if addr.startswith("unix:"):
+                path = addr[5:]
+                try: mode = os.lstat(path).st_mode
+                except FileNotFoundError: mode = None
+                if mode is not None and not stat.S_ISSOCK(mode):
+                    print(f"POLUTIO_STATS: {path} exists and is not a socket, stats server not started", file=sys.stderr)
+                    return
+                if mode is not None: os.remove(path)  # stale socket from a crash
+                self.server = socketserver.ThreadingUnixStreamServer(path, _StatsStreamHandler)
+                self.unix_path = path
+            else:
+                host, _, port = addr.rpartition(":")
+                self.server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), _StatsHTTPHandler)
+        except (OSError, ValueError, AttributeError):  # port in use, bad address, no AF_UNIX
+            self.server = None
+            return
+        self.server.owner = self
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="stats", daemon=True).start()
+        atexit.register(self.close)
+
+    @property
+    def enabled(self) -> bool: return self.server is not None
+
+    def publish(self, snap: dict): self.latest = snap
+
+    def close(self):
+        if self.server is None: return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        if self.unix_path:
+            try: os.remove(self.unix_path)
+            except OSError: pass
+
+# --------------------- profiling ---------------------
+PROFILE_FRAMES = int(os.environ.get("POLUTIO_PROFILE_FRAMES", "300"))  # frames per capture
+PROFILE_DIR = os.environ.get("POLUTIO_PROFILE_DIR", "profiles")
+PROFILE_TOP = 25
+
+# cProfile around the next N rendered frames (update, draw, present; not the pacer's
+# sleep), started by F9 or SIGUSR1. The signal handler only sets a flag.
+class FrameProfiler:
+    def __init__(self, frames: int = PROFILE_FRAMES, out_dir: str = PROFILE_DIR):
+        self.frames = max(1, frames)  # 0 would never finish a capture
+        self.out_dir = out_dir
+        self.pending = False
+        self.prof: Optional[cProfile.Profile] = None
+        self.left = 0
+        self.done = 0  # frames in the current capture
+        self.label = ""
+        self.last_path = ""
+
+    @property
+    def active(self) -> bool: return self.prof is not None
+
+    def request(self, *_):
+        self.pending = True
+
+    def begin_frame(self, label: str):
+        if self.pending and self.prof is None:
+            self.pending = False
+            self.prof = cProfile.Profile()
+            self.left = self.frames
+            self.done = 0
+            self.label = label
+        if self.prof is not None: self.prof.enable()
+
+    # -> path of the .prof file once a capture completes
+    def end_frame(self) -> Optional[str]:
+        if self.prof is None: return None
+        self.prof.disable()
+        self.left -= 1
+        self.done += 1
+        if self.left > 0: return None
+        prof, self.prof = self.prof, None
+        try:
+            return self._write(prof)
+        except OSError:
+            return None
+
+    def _write(self, prof: cProfile.Profile) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        slug = "".join(c if c.isalnum() else "_" for c in self.label).strip("_").lower()
+        base = os.path.join(self.out_dir, time.strftime("polutio-%Y%m%d-%H%M%S") + f"-{slug}")
+        prof.dump_stats(base + ".prof")
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(self.summary(prof))
+        self.last_path = base + ".prof"
+        return self.last_path
+
+    # top functions by cumulative time, overall and for the update_* / draw_* methods
+    def summary(self, prof: cProfile.Profile) -> str:
+        st = pstats.Stats(prof)
+        rows = [(ct, tt, nc, func) for (_, _, func), (_, nc, tt, ct, _) in st.stats.items()]
+        rows.sort(reverse=True)
+        out = io.StringIO()
+        n = max(1, self.done)  # per-frame figures over what was actually captured
+        out.write(f"{self.label}: {n} frames, {st.total_tt * 1000 / n:.2f} ms/frame profiled\n")
+        for title, pick in (("update_*", lambda n: n.startswith("update_")), ("draw_*", lambda n: n.startswith("draw_"))):
+            part = [r for r in rows if pick(r[3])]
+            out.write(f"\n{title}\n{'cum ms/frame':>13} {'own ms/frame':>13} {'calls':>8}  function\n")
+            for ct, tt, nc, func in part[:PROFILE_TOP]:
+                out.write(f"{ct * 1000 / n:13.3f} {tt * 1000 / n:13.3f} {nc:8d}  {func}\n")
+        out.write("\nall functions by cumulative time\n")
+        st.stream = out
+        st.sort_stats("cumulative").print_stats(PROFILE_TOP)
+        return out.getvalue()
+
+# --------------------- run history ---------------------
+RUNS_DB = os.environ.get("POLUTIO_RUNS_DB", "runs.db")
+RUNS_FLUSH_S = 1.0
+RUNS_QUEUE_MAX = 1000   # runs waiting for the writer; new ones are dropped past this
+RUNS_MAX_RETRIES = 3    # a batch that fails this many commits in a row is dropped
+LEADERBOARD_N = 10
+
+RUNS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    level TEXT NOT NULL,
+    result TEXT NOT NULL,
+    progress INTEGER NOT NULL,
+    duration_s REAL NOT NULL,
+    caught_good INTEGER NOT NULL,
+    caught_bad INTEGER NOT NULL,
+    powerups TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_rank ON runs (level, progress DESC, duration_s ASC);
+"""
+RUN_FIELDS = ("ended_at", "level", "result", "progress", "duration_s", "caught_good", "caught_bad", "powerups")
+
+# Finished runs in SQLite (WAL). record() only queues a tuple; a daemon thread owns the
+# write connection and commits batches, so ending a level never waits on disk. Reads
+# use their own connection; WAL lets them run while the writer commits, and the
+# (level, progress, duration) index keeps top-N a short index walk however many runs exist.
+class RunStore:
+    def __init__(self, path: str = RUNS_DB):
+        self.path = path
+        self.queue = deque()
+        self.written = 0
+        self.write_errors = 0
+        self.dropped = 0       # queue full, writer gone, or a batch that kept failing
+        self.failed = False    # no write connection, record() stops queuing
+        self._read = None      # top()'s own connection, WAL readers never wait for the writer
+        self._stop = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._writer, name="runs", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=5.0)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent, a crash may only lose the last commit
+        return db
+
+    def record(self, level: str, result: str, progress: int, duration_s: float,
+               caught_good: int, caught_bad: int, powerups: Dict[str, int]):
+        if self.failed or len(self.queue) >= RUNS_QUEUE_MAX:
+            self.dropped += 1
+            return
+        self.queue.append((time.time(), level, result, progress, round(duration_s, 3),
+                           caught_good, caught_bad, json.dumps(powerups, separators=(",", ":"))))
+        self._wake.set()
+
+    def top(self, level: str, n: int = LEADERBOARD_N) -> List[dict]:
+        # runs still waiting for the writer count too, so a fresh result shows up at once.
+        # The queue is read first: the writer commits before it pops, so a run is in the
+        # query, in this copy, or in both (same tuple, dropped below).
+        pending = [r for r in list(self.queue) if r[1] == level]
+        rows = []
+        try:
+            if self._read is None: self._read = self._connect()
+            rows = self._read.execute(
+                "SELECT " + ", ".join(RUN_FIELDS) + " FROM runs WHERE level = ? "
+                "ORDER BY progress DESC, duration_s ASC LIMIT ?", (level, n)).fetchall()
+        except sqlite3.Error:
+            pass  # e.g. the writer hasn't created the table yet
+        seen = set(rows)
+        rows += [r for r in pending if r not in seen]
+        rows.sort(key=lambda r: (-r[3], r[4]))
+        return [dict(zip(RUN_FIELDS, r)) for r in rows[:n]]
+
+    def close(self):
+        if self._thread is None: return
+        self._stop = True
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self._thread = None
+        if self._read is not None: self._read.close()
+
+    def _writer(self):
+        try:
+            db = self._connect()
+            db.executescript(RUNS_SCHEMA)
+        except sqlite3.Error:
+            self.write_errors += 1
+            self.failed = True
+            self.dropped += len(self.queue)
+            self.queue.clear()
+            return
+        sql = f"INSERT INTO runs ({', '.join(RUN_FIELDS)}) VALUES ({', '.join('?' * len(RUN_FIELDS))})"
+        fails = 0
+        while True:
+            self._wake.wait(RUNS_FLUSH_S)
+            self._wake.clear()
+            stop = self._stop
+            batch = list(self.queue)  # left in the queue until committed, so top() still sees them
+            if batch:
+                try:
+                    with db: db.executemany(sql, batch)
+                    self.written += len(batch)
+                    fails = 0
+                except sqlite3.Error:
+                    self.write_errors += 1
+                    fails += 1
+                if fails == 0 or fails >= RUNS_MAX_RETRIES or stop:
+                    if fails: self.dropped += len(batch)
+                    fails = 0
+                    for _ in batch: self.queue.popleft()
+            if stop: break
+        db.close()
+
+# --------------------- snapshots ---------------------
+SNAPSHOT_VERSION = 3
+RESUME_FILE = "resume.json"   # written when the game is closed mid-level
+REWIND_S = 5.0                # how far back the rewind key goes
+REWIND_EVERY_S = 0.25         # snapshot spacing in the rewind buffer
+
 # --------------------- data classes ---------------------
 @dataclass
 class BgStage:
@@ -161,6 +887,12 @@ class LevelConfig:
     basket_expand_px: int = 120
     fall_scale_k: float = 1.0
 
+# --------------------- background stages ---------------------
+STAGE_THRESHOLDS = [0, 20, 40, 60, 80, 100]
+BG_BLEND_SPAN = 4    # progress points a stage cross-fade is spread over, centred on the threshold
+BG_BLEND_STEPS = 3   # precomputed in-between frames per stage boundary
+BG_BLEND_SCALE = 2   # blend frames are stored at 1/N resolution and scaled up while shown (1 = full res)
+
 # --------------------- levels ---------------------
 LEVELS: List[LevelConfig] = [
     LevelConfig(
@@ -294,15 +1026,787 @@ LEVELS: List[LevelConfig] = [
     ),
 ]
 
+# --------------------- background store ---------------------
+# Memory budget for decoded images in MB ("" = off: every stage stays decoded, as before).
+MEM_BUDGET_MB = os.environ.get("POLUTIO_MEM_BUDGET_MB", "")
+MEM_BUDGET_BYTES = int(float(MEM_BUDGET_MB) * 1024 * 1024) if MEM_BUDGET_MB else None
+BG_PACK_LEVEL = 1  # zlib level for packed stages: quick to expand, still a large saving on art
+
+def surface_bytes(surf: Optional[pygame.Surface]) -> int:
+    return surf.get_width() * surf.get_height() * surf.get_bytesize() if surf else 0
+
+# A level's stage backgrounds and the cross-fade frames between them. Without a budget
+# everything is decoded up front. With one, every stage is also kept as zlib'd RGB and
+# only what is on screen plus the neighbouring stages (the side progress last moved
+# towards first, while they fit) stays decoded. Neighbours are expanded on a worker
+# thread as progress moves, so a stage is ready before its threshold is reached.
+# Split-screen sessions on the same level share one store (see acquire_backgrounds);
+# each owner's position is kept on screen, prefetch follows whoever moved last.
+class BackgroundStore:
+    def __init__(self, level: LevelConfig, pos: float = 0.0, budget: Optional[int] = MEM_BUDGET_BYTES, owner=None):
+        self.level = level
+        self.budget = budget
+        n = len(level.backgrounds)
+        self.images: List[Optional[pygame.Surface]] = [None] * n
+        self.packed: List[Optional[bytes]] = [None] * n
+        self.missing = [False] * n                      # no file, drawn as the fallback color
+        self.blends: Dict[int, List[pygame.Surface]] = {}  # boundary i (stage i -> i+1) -> frames
+        self.stalls = 0          # stages that had to be expanded on the game thread
+        self.blend_ms = 0.0      # time spent building cross-fade frames, here or on the worker
+        self.positions: Dict[int, float] = {id(owner): pos}  # id(owner) -> stage position
+        self.heading = 1         # last direction progress moved in, prefetch favours that side
+        self.pending = set()     # jobs queued or running
+        self.wanted_stages = set()
+        self._todo = deque()
+        self._done = deque()
+        self._stop = False
+        self._wake = threading.Event()
+        t0 = pygame.time.get_ticks()
+        if budget is None:
+            for i, stage in enumerate(level.backgrounds):
+                img = load_image(stage.image_path, (VIRTUAL_W, VIRTUAL_H)) if stage.image_path else None
+                self.missing[i] = img is None
+                self.images[i] = img
+            for i in range(n - 1): self.blends[i] = self._blend(i, self.images[i], self.images[i + 1])
+        else:
+            # only the stages on screen are decoded here; the worker decodes and packs the rest
+            # one at a time, so the full level is never resident at once
+            for i, stage in enumerate(level.backgrounds):
+                self.missing[i] = not (stage.image_path and os.path.isfile(stage.image_path))
+            lo = min(int(pos), n - 1)
+            for i in sorted(range(n), key=lambda i: abs(i - lo)):  # nearest first
+                if self.missing[i]: continue
+                img = load_image(level.backgrounds[i].image_path, (VIRTUAL_W, VIRTUAL_H)) if i in (lo, lo + 1) else None
+                if i in (lo, lo + 1) and img is None: self.missing[i] = True; continue
+                self.images[i] = img
+                kind = "pack" if img is not None else "load"
+                self.pending.add((kind, i))
+                self._todo.append((kind, i, img))
+            threading.Thread(target=self._worker, name="bg-store", daemon=True).start()
+            self.update(pos, owner)
+        self.build_ms = pygame.time.get_ticks() - t0
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+        # the texture cache holds refs too, a released level would otherwise stay uploaded
+        for i in range(len(self.images)): self._evict_stage(i, force=True)
+        for i in list(self.blends): self._evict_blend(i)
+
+    # ---------- expansion (worker thread, or the game thread on a stall) ----------
+    def _expand(self, i: int) -> pygame.Surface:
+        raw = zlib.decompress(self.packed[i])
+        return pygame.image.frombytes(raw, (VIRTUAL_W, VIRTUAL_H), "RGB").convert()
+
+    def _pack(self, img: pygame.Surface) -> bytes:
+        return zlib.compress(pygame.image.tobytes(img, "RGB"), BG_PACK_LEVEL)
+
+    def _load(self, i: int):
+        img = load_image(self.level.backgrounds[i].image_path, (VIRTUAL_W, VIRTUAL_H))
+        return None if img is None else (self._pack(img), img)
+
+    def _small(self, i: int, img: Optional[pygame.Surface]) -> pygame.Surface:
+        sw, sh = VIRTUAL_W // BG_BLEND_SCALE, VIRTUAL_H // BG_BLEND_SCALE
+        if img is None:
+            small = pygame.Surface((sw, sh)).convert()
+            small.fill(self.level.backgrounds[i].fallback_color)
+            return small
+        return img.convert() if BG_BLEND_SCALE == 1 else pygame.transform.smoothscale(img.convert(), (sw, sh))
+
+    # a few fixed cross-fade frames per boundary, so a transition costs one blit/scale per frame
+    def _blend(self, i: int, img_a, img_b) -> List[pygame.Surface]:
+        t0 = time.perf_counter()
+        a, b = self._small(i, img_a), self._small(i + 1, img_b)
+        frames = []
+        for k in range(1, BG_BLEND_STEPS + 1):
+            f = a.copy()
+            b.set_alpha(int(255 * k / (BG_BLEND_STEPS + 1)))
+            f.blit(b, (0, 0))
+            frames.append(f)
+        self.blend_ms += (time.perf_counter() - t0) * 1000
+        return frames
+
+    def _worker(self):
+        while not self._stop:
+            self._wake.wait(0.5)
+            self._wake.clear()
+            while self._todo and not self._stop:
+                kind, i, src = self._todo.popleft()
+                try:
+                    if kind == "stage": result = self._expand(i)
+                    elif kind == "pack": result = self._pack(src)
+                    elif kind == "load": result = self._load(i)
+                    else: result = self._blend(i, *src)
+                except (pygame.error, zlib.error, ValueError):
+                    result = None
+                self._done.append((kind, i, result))
+
+    # ---------- game thread ----------
+    def _evict_stage(self, i: int, force: bool = False):
+        if self.packed[i] is None and not force: return  # nothing to rebuild it from
+        if self.images[i] is not None: forget_surface(self.images[i])
+        self.images[i] = None
+
+    def _evict_blend(self, i: int):
+        for f in self.blends.pop(i, None) or (): forget_surface(f)
+
+    def _plan(self, pos: float):
+        n = len(self.images)
+        def span(p):
+            lo = min(int(p), n - 1)
+            return lo, (lo + 1 if p > lo else lo)  # mid cross-fade both ends are on screen
+        stage_b = VIRTUAL_W * VIRTUAL_H * 4
+        blend_b = BG_BLEND_STEPS * (VIRTUAL_W // BG_BLEND_SCALE) * (VIRTUAL_H // BG_BLEND_SCALE) * 4
+        shown, visible = [], set()
+        for p in self.positions.values():
+            lo, hi = span(p)
+            visible |= {lo, hi}
+            shown += [("stage", lo)] + ([("stage", hi), ("blend", lo)] if hi != lo else [])
+        lo, hi = span(pos)
+        ahead, behind = [("stage", hi + 1), ("blend", hi)], [("stage", lo - 1), ("blend", lo - 1)]
+        order = shown + (ahead + behind if self.heading > 0 else behind + ahead)
+        used = self.fixed_bytes() + sum(len(p) for p in self.packed if p)
+        stages, blends = set(), set()
+        for kind, i in order:
+            if not (0 <= i < n - (kind == "blend")): continue
+            if i in (stages if kind == "stage" else blends): continue
+            size = 0 if kind == "stage" and self.missing[i] else (stage_b if kind == "stage" else blend_b)
+            on_screen = kind == "stage" and i in visible  # would only be stalled back in
+            if not on_screen and used + size > self.budget: continue
+            if kind == "blend" and not {i, i + 1} <= stages: continue
+            used += size
+            (stages if kind == "stage" else blends).add(i)
+        return stages, blends
+
+    # called every gameplay frame with the continuous stage position
+    def update(self, pos: float, owner=None):
+        if self.budget is None: return
+        last = self.positions.get(id(owner), pos)
+        if pos != last: self.heading = 1 if pos > last else -1
+        self.positions[id(owner)] = pos
+        while self._done:
+            kind, i, result = self._done.popleft()
+            self.pending.discard((kind, i))
+            if result is None:
+                if kind == "load": self.missing[i] = True  # unreadable, fall back to the color
+                continue
+            if kind == "load":  # the decoded copy is kept only if the plan still wants it
+                self.packed[i], img = result
+                if i in self.wanted_stages and self.images[i] is None: self.images[i] = img
+            elif kind == "pack": self.packed[i] = result
+            elif kind == "stage" and self.images[i] is None: self.images[i] = result
+            elif kind == "blend" and i not in self.blends: self.blends[i] = result
+        self.wanted_stages, wanted_blends = self._plan(pos)
+        for i in range(len(self.images)):
+            if i not in self.wanted_stages: self._evict_stage(i)
+        for i in list(self.blends):
+            if i not in wanted_blends: self._evict_blend(i)
+        jobs = [("stage", i) for i in sorted(self.wanted_stages)
+                if self.images[i] is None and self.packed[i] is not None]  # unpacked ones are already queued
+        jobs += [("blend", i) for i in sorted(wanted_blends) if i not in self.blends]
+        for kind, i in jobs:
+            if (kind, i) in self.pending: continue
+            src = None
+            if kind == "blend":
+                a, b = self.images[i], self.images[i + 1]
+                if (a is None and not self.missing[i]) or (b is None and not self.missing[i + 1]):
+                    continue  # queued again once both stages are decoded
+                src = (a, b)  # the worker holds its own refs, eviction can't pull them away
+            self.pending.add((kind, i))
+            self._todo.append((kind, i, src))
+        if self._todo: self._wake.set()
+
+    def image(self, i: int) -> Optional[pygame.Surface]:
+        img = self.images[i]
+        if img is None and self.packed[i] is not None:
+            # not expanded in time (e.g. a snapshot restored far away): do it now
+            self.stalls += 1
+            img = self.images[i] = self._expand(i)
+        elif img is None and not self.missing[i] and ("load", i) in self.pending:
+            self.stalls += 1  # still waiting for its first decode
+            img = self.images[i] = load_image(self.level.backgrounds[i].image_path, (VIRTUAL_W, VIRTUAL_H))
+        return img
+
+    def blend(self, i: int, k: int) -> Optional[pygame.Surface]:
+        frames = self.blends.get(i)
+        return frames[k - 1] if frames else None
+
+    def fixed_bytes(self) -> int:
+        return (surface_bytes(GAME_SURF) + surface_bytes(MAIN_MENU_BG_IMG)
+                + sum(surface_bytes(s) for s in SPLIT_SURFACES))
+
+    def resident_bytes(self) -> int:
+        return (self.fixed_bytes() + sum(surface_bytes(s) for s in self.images)
+                + sum(surface_bytes(f) for frames in self.blends.values() for f in frames)
+                + sum(len(p) for p in self.packed if p))
+
+    def stats(self) -> dict:
+        resident = self.resident_bytes()
+        return {
+            "budget_bytes": self.budget, "resident_bytes": resident,
+            "over_budget": self.budget is not None and resident > self.budget,
+            "packed_bytes": sum(len(p) for p in self.packed if p),
+            "decoded": [i for i, s in enumerate(self.images) if s is not None],
+            "blends": sorted(self.blends), "stalls": self.stalls,
+            "build_ms": self.build_ms, "blend_build_ms": round(self.blend_ms, 2),
+        }
+
+_BG_STORES: Dict[str, BackgroundStore] = {}  # level name -> store shared by the sessions on it
+
+def acquire_backgrounds(level: LevelConfig, pos: float, owner) -> BackgroundStore:
+    store = _BG_STORES.get(level.name)
+    if store is None:
+        store = _BG_STORES[level.name] = BackgroundStore(level, pos, owner=owner)
+    else:
+        store.positions[id(owner)] = pos
+    return store
+
+def release_backgrounds(store: BackgroundStore, owner):
+    store.positions.pop(id(owner), None)
+    if not store.positions:
+        store.close()
+        if _BG_STORES.get(store.level.name) is store: del _BG_STORES[store.level.name]
+
+# --------------------- spawn schedule ---------------------
+SPAWN_BATCH_S = 30.0           # timeline is extended this far at a time once play outlasts it
+SPECIAL_MIN_INTERVAL_MS = 250
+
+# Seeded source of whole batches of draws. numpy's Generator when available, so a
+# given seed only reproduces the same timeline on the same kind of install.
+class BatchRng:
+    def __init__(self, seed: int):
+        self.np = np.random.default_rng(seed) if np is not None else None
+        self.py = random.Random(seed)
+
+    def random(self, n: int) -> list:
+        if self.np is not None: return self.np.random(n).tolist()
+        return [self.py.random() for _ in range(n)]
+
+    def uniform(self, lo: float, hi: float, n: int) -> list:
+        if self.np is not None: return self.np.uniform(lo, hi, n).tolist()
+        return [self.py.uniform(lo, hi) for _ in range(n)]
+
+    def integers(self, lo: int, hi: int, n: int) -> list:  # hi exclusive
+        if self.np is not None: return self.np.integers(lo, hi, n).tolist()
+        return [self.py.randrange(lo, hi) for _ in range(n)]
+
+    def choice(self, weights: List[float], n: int) -> list:
+        if self.np is not None:
+            p = np.asarray(weights, dtype=float)
+            return self.np.choice(len(weights), n, p=p / p.sum()).tolist()
+        return self.py.choices(range(len(weights)), weights=weights, k=n)
+
+def _pick_sprite(good: bool, i: int) -> str:
+    files = GOOD_ITEM_FILES if good else BAD_ITEM_FILES
+    return files[i % len(files)] if files else ""
+
+# A level's spawns, drawn up front. Ticks sit at exact multiples of the interval on
+# a clock fed with frame dt, so nothing is lost to timer resets whatever the frame rate.
+# Rows per stream: items (t, good, sprite, vy), powerups (t, kind, vy),
+# special (t, good, sprite, x, vx, vy). Spawning is a cursor walk over them.
+class SpawnSchedule:
+    def __init__(self, level: LevelConfig, seed: int):
+        self.level = level
+        self.seed = seed
+        self.rng = BatchRng(seed)
+        self.kinds = list(POWERUPS)
+        self.clock = 0.0
+        self.horizon = 0.0
+        self.intervals: Dict[str, float] = {}
+        if level.name == "SPECIAL LEVEL":
+            self.intervals["special"] = max(SPECIAL_MIN_INTERVAL_MS, level.spawn_interval_ms - 100) / 1000.0
+        else:
+            self.intervals["items"] = level.spawn_interval_ms / 1000.0
+            if level.powerup_interval_ms > 0: self.intervals["powerups"] = level.powerup_interval_ms / 1000.0
+        self.rows: Dict[str, list] = {name: [] for name in self.intervals}
+        self.ticks = dict.fromkeys(self.intervals, 0)
+        self.cursor = dict.fromkeys(self.intervals, 0)
+        self.extend(float(level.time_limit_s))
+
+    def extend(self, until: float):
+        for name, interval in self.intervals.items():  # fixed order keeps a seed reproducible
+            k0 = self.ticks[name]
+            n = int(until / interval + 1e-9) - k0
+            if n <= 0: continue
+            t = [(k0 + i + 1) * interval for i in range(n)]
+            self.rows[name].extend(getattr(self, "_draw_" + name)(t))
+            self.ticks[name] = k0 + n
+        self.horizon = max(self.horizon, until)
+
+    def _draw_items(self, t: list) -> list:
+        lv, rng, n = self.level, self.rng, len(t)
+        good = [r < lv.good_prob for r in rng.random(n)]
+        pick = rng.integers(0, 1 << 16, n)
+        vy = rng.uniform(*lv.fall_speed_range, n)
+        return [(t[i], good[i], _pick_sprite(good[i], pick[i]), vy[i]) for i in range(n)]
+
+    def _draw_powerups(self, t: list) -> list:
+        lv, rng, n = self.level, self.rng, len(t)
+        drop = rng.random(n)
+        kind = rng.choice([POWERUPS[k].weight for k in self.kinds], n)
+        vy = rng.uniform(*lv.fall_speed_range, n)
+        return [(t[i], self.kinds[kind[i]], vy[i] * 0.9) for i in range(n) if drop[i] < lv.powerup_drop_prob]
+
+    def _draw_special(self, t: list) -> list:
+        lv, rng = self.level, self.rng
+        # bursts of 1-3 launched together, flattened to one row per item
+        t = [ti for ti, c in zip(t, rng.integers(1, 4, len(t))) for _ in range(c)]
+        n = len(t)
+        good = [r < lv.good_prob for r in rng.random(n)]
+        pick = rng.integers(0, 1 << 16, n)
+        x = rng.uniform(VIRTUAL_W * 0.18, VIRTUAL_W * 0.82, n)
+        vx = rng.uniform(-520, 520, n)
+        vy = rng.uniform(1350, 1750, n)  # launched upwards, apex around mid/top screen
+        return [(t[i], good[i], _pick_sprite(good[i], pick[i]), x[i], vx[i], -vy[i]) for i in range(n)]
+
+    def advance(self, dt: float):
+        self.clock += dt
+        while self.clock >= self.horizon: self.extend(self.horizon + SPAWN_BATCH_S)
+
+    # rows that came due since the last call
+    def due(self, name: str) -> list:
+        rows, i = self.rows.get(name), self.cursor.get(name, 0)
+        if not rows: return []
+        j = i
+        while j < len(rows) and rows[j][0] <= self.clock: j += 1
+        self.cursor[name] = j
+        return rows[i:j]
+
+    # compact form for snapshots: the rows themselves are rebuilt from the seed
+    def state(self) -> list:
+        return [self.seed, self.clock, self.horizon, dict(self.cursor)]
+
+    @classmethod
+    def from_state(cls, level: LevelConfig, st: list) -> "SpawnSchedule":
+        seed, clock, horizon, cursor = st
+        sched = cls(level, seed)
+        while sched.horizon < horizon: sched.extend(sched.horizon + SPAWN_BATCH_S)
+        sched.clock = clock
+        sched.cursor.update(cursor)
+        return sched
+
+    # whole timeline up to until_s as dicts, for previewing or checking a level offline
+    def preview(self, until_s: Optional[float] = None) -> List[dict]:
+        until_s = float(self.level.time_limit_s) if until_s is None else until_s
+        if until_s > self.horizon: self.extend(until_s)
+        fields = {"items": ("t", "good", "sprite", "vy"), "powerups": ("t", "kind", "vy"),
+                  "special": ("t", "good", "sprite", "x", "vx", "vy")}
+        out = [dict(zip(fields[name], row), stream=name) for name, rows in self.rows.items() for row in rows if row[0] <= until_s]
+        out.sort(key=lambda r: r["t"])
+        return out
+
+# --------------------- render queue ---------------------
+# Draw order, lowest first. Every on-screen thing belongs to exactly one layer.
+LAYER_BACKGROUND = 0
+LAYER_PRINTER = 1
+LAYER_ITEMS = 2
+LAYER_PIECES = 3
+LAYER_PARTICLES = 4
+LAYER_POWERUPS = 5
+LAYER_GIRL = 6
+LAYER_HUD = 7
+LAYER_TRAIL = 8
+NUM_LAYERS = 9
+
+class RenderQueue:
+    def __init__(self, backend=None):
+        self.backend = backend  # TextureBackend, or None for software blits
+        self.sprites: List[list] = [[] for _ in range(NUM_LAYERS)]
+        self.xforms: List[list] = [[] for _ in range(NUM_LAYERS)]
+        self.calls: List[list] = [[] for _ in range(NUM_LAYERS)]
+        self.hud: List[tuple] = []  # split seats: (key, rect, scale, piece, pos) per HUD call
+
+    # sprites are resubmitted by every update, so a paused frame redraws the last ones
+    def begin(self):
+        for batch in self.sprites: batch.clear()
+        for batch in self.xforms: batch.clear()
+
+    def submit(self, surf: pygame.Surface, pos, layer: int):
+        self.sprites[layer].append((surf, pos))
+
+    # scaled to rect and rotated (degrees, counter-clockwise) around its center
+    def submit_xform(self, surf: pygame.Surface, rect: pygame.Rect, angle: float, layer: int):
+        self.xforms[layer].append((surf, rect, angle))
+
+    # for layers that aren't plain blits (fills, text, lines), run once per flush.
+    # gpu(renderer) draws the same thing with renderer primitives on the texture backend;
+    # key is anything that changes whenever fn's output would (None = always redraw);
+    # rect bounds what a HUD call draws (None = anywhere), so a split seat caches just that.
+    def submit_call(self, fn, layer: int, gpu=None, key=None, rect=None):
+        self.calls[layer].append((fn, gpu, key, rect))
+
+    def flush(self, target: pygame.Surface):
+        if self.backend is not None: return self.backend.flush(self, target)
+        if target.get_width() != VIRTUAL_W: return self._flush_scaled(target)
+        for layer in range(NUM_LAYERS):
+            batch = self.sprites[layer]
+            if batch: target.blits(batch, False)
+            for surf, rect, angle in self.xforms[layer]:
+                if surf.get_size() != rect.size: surf = pygame.transform.scale(surf, rect.size)
+                if angle: surf = pygame.transform.rotate(surf, angle)
+                target.blit(surf, surf.get_rect(center=rect.center))
+            calls = self.calls[layer]
+            for fn, _, _, _ in calls: fn(target)
+            calls.clear()
+
+    # A split seat draws at its viewport size. Sprites are scaled once and cached; calls
+    # below the HUD scale themselves to the target. HUD calls are laid out in virtual
+    # pixels: each one draws into the shared GAME_SURF, its rect is scaled down, and that
+    # piece is reused while the call's key holds.
+    def _flush_scaled(self, target: pygame.Surface):
+        k = target.get_width() / VIRTUAL_W
+        for layer in range(NUM_LAYERS):
+            batch = self.sprites[layer]
+            if batch:
+                target.blits([(scaled_surface(surf, (round(surf.get_width() * k), round(surf.get_height() * k))),
+                               (round(x * k), round(y * k))) for surf, (x, y) in batch], False)
+            for surf, rect, angle in self.xforms[layer]:
+                r = pygame.Rect(round(rect.x * k), round(rect.y * k), max(1, round(rect.w * k)), max(1, round(rect.h * k)))
+                surf = scaled_surface(surf, r.size)
+                if angle: surf = pygame.transform.rotate(surf, angle)
+                target.blit(surf, surf.get_rect(center=r.center))
+            calls = self.calls[layer]
+            if layer == LAYER_HUD:
+                self.hud = [self._hud_piece(target, k, call, self.hud[i] if i < len(self.hud) else None)
+                            for i, call in enumerate(calls)]
+            else:
+                for fn, _, _, _ in calls: fn(target)
+            calls.clear()
+
+    def _hud_piece(self, target: pygame.Surface, k: float, call, last):
+        fn, _, key, rect = call
+        r = rect or GAME_SURF.get_rect()
+        if key is None or last is None or last[:3] != (key, r, k):
+            GAME_SURF.fill((0, 0, 0, 0), r)
+            fn(GAME_SURF)
+            size = (max(1, round(r.w * k)), max(1, round(r.h * k)))
+            piece = pygame.transform.scale(GAME_SURF.subsurface(r), size)
+            piece.set_alpha(255, pygame.RLEACCEL)  # mostly transparent, RLE skips the gaps
+            last = (key, r, k, piece, (round(r.x * k), round(r.y * k)))
+        target.blit(last[3], last[4])
+        return last
+
+# Sprites scaled down for split seats: id(source) -> (source, {size: scaled}), least recently
+# used first. The ref keeps the id unique; forget_surface drops a released source.
+SCALED_CACHE_MAX = 512
+_SCALED_CACHE: Dict[int, tuple] = {}
+
+def scaled_surface(surf: pygame.Surface, size) -> pygame.Surface:
+    if surf.get_size() == size: return surf
+    entry = _SCALED_CACHE.pop(id(surf), None)
+    if entry is None:
+        if len(_SCALED_CACHE) >= SCALED_CACHE_MAX: _SCALED_CACHE.pop(next(iter(_SCALED_CACHE)))
+        entry = (surf, {})
+    _SCALED_CACHE[id(surf)] = entry
+    out = entry[1].get(size)
+    if out is None: out = entry[1][size] = pygame.transform.scale(surf, size)
+    return out
+
+def forget_surface(surf: pygame.Surface):
+    _SCALED_CACHE.pop(id(surf), None)
+    if TEXTURES is not None: TEXTURES.forget(surf)
+
+# --------------------- texture backend ---------------------
+TEXTURE_CACHE_MAX = 512  # uploaded sprites kept; sliced halves churn, everything else stays hot
+
+# Draws a RenderQueue through SDL2 textures. Sprites are uploaded once and looked up
+# by surface identity; calls with a gpu variant (particles, fill colors) go straight to
+# the renderer. The rest draw into the transparent GAME_SURF, streamed up as one overlay:
+# normally only the HUD layers above every sprite, once per frame in present(), and
+# not at all while their keys match the overlay already on the GPU.
+class TextureBackend:
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.cache: Dict[int, tuple] = {}  # id(surface) -> (surface, texture); the ref keeps the id unique
+        self.overlay = Texture(renderer, (VIRTUAL_W, VIRTUAL_H), streaming=True)
+        self.overlay.blend_mode = 1  # SDL_BLENDMODE_BLEND
+        self.uploads = 0
+        self.overlay_uploads = 0
+        self.overlay_keys = None  # keys of what the overlay texture holds, None = unknown
+        self.next_keys = None     # keys of what target holds after this frame's flush
+        self.reuse = False        # this frame's HUD matches the overlay texture
+        self.seat_textures: Dict[int, Texture] = {}  # split screen: seat index -> its frame
+
+    def texture(self, surf: pygame.Surface):
+        key = id(surf)
+        entry = self.cache.pop(key, None)
+        CACHE_STATS["textures"][entry is None] += 1
+        if entry is None:
+            if len(self.cache) >= TEXTURE_CACHE_MAX: self.cache.pop(next(iter(self.cache)))
+            entry = (surf, Texture.from_surface(self.renderer, surf))
+            self.uploads += 1
+        self.cache[key] = entry  # re-inserted, so dict order is least recently used first
+        return entry[1]
+
+    def forget(self, surf: pygame.Surface):
+        self.cache.pop(id(surf), None)
+
+    def begin(self):
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+        self.reuse = False
+        self.next_keys = None
+
+    def _draw_overlay(self, target: pygame.Surface):
+        self.overlay.update(target)
+        self.overlay_uploads += 1
+        self.overlay.draw()
+
+    def flush(self, rq: "RenderQueue", target: pygame.Surface):
+        # call layers above the last thing drawn on the GPU only need the overlay from present()
+        top = -1
+        for layer in range(NUM_LAYERS):
+            if rq.sprites[layer] or rq.xforms[layer] or any(gpu for _, gpu, _, _ in rq.calls[layer]): top = layer
+        dirty = mixed = False
+        for layer in range(top + 1):
+            batch, xforms, calls = rq.sprites[layer], rq.xforms[layer], rq.calls[layer]
+            if dirty and (batch or xforms or calls):
+                self._draw_overlay(target)  # a surface-only call under sprites: stream it up now
+                dirty = False
+            for surf, pos in batch:
+                self.texture(surf).draw(dstrect=pos)
+            for surf, rect, angle in xforms:
+                self.texture(surf).draw(dstrect=rect, angle=-angle)  # SDL turns clockwise
+            for fn, gpu, _, _ in calls:
+                if gpu is not None:
+                    gpu(self.renderer)
+                    continue
+                if not dirty: target.fill((0, 0, 0, 0))
+                fn(target)
+                dirty = mixed = True
+            calls.clear()
+        hud = [c for layer in range(top + 1, NUM_LAYERS) for c in rq.calls[layer]]
+        keys = [key for _, _, key, _ in hud]
+        if not mixed and not dirty and None not in keys and keys == self.overlay_keys:
+            self.reuse = True  # the overlay texture already shows exactly this
+        else:
+            if not dirty: target.fill((0, 0, 0, 0))
+            for fn, _, _, _ in hud: fn(target)
+            self.next_keys = None if mixed or None in keys else keys
+        for layer in range(top + 1, NUM_LAYERS): rq.calls[layer].clear()
+
+    # split screen: each seat is a finished software frame, streamed up as its own opaque texture
+    def present_seats(self, seats):
+        for i, (surf, rect) in enumerate(seats):
+            tex = self.seat_textures.get(i)
+            if tex is None or (tex.width, tex.height) != surf.get_size():
+                tex = self.seat_textures[i] = Texture(self.renderer, surf.get_size(), streaming=True)
+                tex.blend_mode = 0  # SDL_BLENDMODE_NONE, the padding byte isn't alpha
+            tex.update(surf)
+            tex.draw(dstrect=rect)
+        self.renderer.present()
+
+    # whatever is left in target (the HUD, or a whole menu screen) goes on top
+    def present(self, target: pygame.Surface):
+        if self.reuse:
+            self.overlay.draw()
+        else:
+            self._draw_overlay(target)
+            self.overlay_keys = self.next_keys
+        self.renderer.present()
+
+TEXTURES = TextureBackend(RENDERER) if RENDERER is not None else None
+
+# --------------------- particles ---------------------
+PARTICLE_CAPACITY = 2048
+PARTICLE_SIZE = 3  # drawn as NxN pixel squares
+PARTICLE_TILE = 8  # texture backend: particle cells per side of a drawn tile
+
+# Fixed-size struct-of-arrays pool. Update and draw are a handful of numpy ops no
+# matter how many bursts overlap; when the pool fills up new bursts get thinner.
+class ParticleSystem:
+    def __init__(self, capacity: int = PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.n = 0
+        self.grid = self.texture = None  # texture backend only, made on first draw_gpu
+        self.runs = 0                     # texture draws the last draw_gpu took
+        if np is None: return
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.color = np.zeros(capacity, np.uint32)
+
+    def clear(self): self.n = 0
+
+    def emit(self, x, y, count: int, color, speed=(200, 600), angle=(0.0, 6.2832), life=(0.3, 0.7)):
+        if np is None: return
+        free = self.capacity - self.n
+        half = self.capacity // 2
+        if self.n > half:
+            count = count * free // (self.capacity - half)
+        count = min(count, free)
+        if count <= 0: return
+        i, j = self.n, self.n + count
+        a = np.random.uniform(angle[0], angle[1], count)
+        v = np.random.uniform(speed[0], speed[1], count)
+        self.pos[i:j, 0] = x
+        self.pos[i:j, 1] = y
+        self.vel[i:j, 0] = np.cos(a) * v
+        self.vel[i:j, 1] = np.sin(a) * v
+        self.life[i:j] = np.random.uniform(life[0], life[1], count)
+        self.color[i:j] = GAME_SURF.map_rgb(color) & 0xFFFFFFFF  # signed on surfaces with alpha
+        self.n = j
+
+    def update(self, dt: float):
+        n = self.n
+        if n == 0: return
+        self.vel[:n, 1] += GRAVITY * dt
+        self.pos[:n] += self.vel[:n] * dt
+        self.life[:n] -= dt
+        alive = (self.life[:n] > 0) & (self.pos[:n, 1] < VIRTUAL_H)
+        k = int(np.count_nonzero(alive))
+        if k < n:
+            for arr in (self.pos, self.vel, self.life, self.color):
+                arr[:k] = arr[:n][alive]
+            self.n = k
+
+    def draw(self, surf: pygame.Surface):
+        n = self.n
+        if n == 0: return
+        w, h = surf.get_size()
+        k = w / VIRTUAL_W  # split seats draw at their own size
+        size = max(1, round(PARTICLE_SIZE * k))
+        xs = (self.pos[:n, 0] * k).astype(np.int32)
+        ys = (self.pos[:n, 1] * k).astype(np.int32)
+        ok = (xs >= 0) & (xs < w - size) & (ys >= 0) & (ys < h - size)
+        xs, ys, cs = xs[ok], ys[ok], self.color[:n][ok]
+        px = pygame.surfarray.pixels2d(surf)
+        for dx in range(size):
+            for dy in range(size):
+                px[xs + dx, ys + dy] = cs
+        del px  # unlock before anything else blits
+
+    # texture backend: one texel per particle on a grid of PARTICLE_SIZE cells, written by
+    # the same numpy scatter. The box around the live particles is streamed up in one go and
+    # drawn back at full size tile by tile, skipping empty tiles, so the cost is capped by the
+    # tile count rather than the particle count. Positions snap to the cell grid.
+    def draw_gpu(self, renderer):
+        n = self.n
+        if n == 0: return
+        gw, gh = VIRTUAL_W // PARTICLE_SIZE, VIRTUAL_H // PARTICLE_SIZE
+        if self.texture is None:
+            self.grid = pygame.Surface((gw, gh), pygame.SRCALPHA).convert_alpha()
+            self.texture = Texture(renderer, (gw, gh), streaming=True)
+            self.texture.blend_mode = 1  # SDL_BLENDMODE_BLEND
+        xs = (self.pos[:n, 0] // PARTICLE_SIZE).astype(np.int32)
+        ys = (self.pos[:n, 1] // PARTICLE_SIZE).astype(np.int32)
+        ok = (xs >= 0) & (xs < gw) & (ys >= 0) & (ys < gh)
+        if not ok.any(): return
+        xs, ys, cs = xs[ok], ys[ok], self.color[:n][ok]
+        t, s = PARTICLE_TILE, PARTICLE_SIZE
+        tw, th = (gw + t - 1) // t, (gh + t - 1) // t
+        tx, ty = xs // t, ys // t
+        # whole tiles, so none of the tiles drawn below shows stale texels
+        area = pygame.Rect(int(tx.min()) * t, int(ty.min()) * t, (int(tx.max() - tx.min()) + 1) * t,
+                           (int(ty.max() - ty.min()) + 1) * t).clip(self.grid.get_rect())
+        self.grid.fill((0, 0, 0, 0), area)
+        px = pygame.surfarray.pixels2d(self.grid)
+        px[xs, ys] = cs
+        del px
+        self.texture.update(self.grid.subsurface(area), area)
+        # occupied tiles, runs of neighbours in a row go out as one draw
+        tiles = np.unique(ty * tw + tx)
+        starts = np.flatnonzero((np.diff(tiles, prepend=-2) != 1) | (tiles % tw == 0))
+        ends = np.append(starts[1:], len(tiles)) - 1
+        src, dst = pygame.Rect(0, 0, 0, t), pygame.Rect(0, 0, 0, t * s)
+        for a, b in zip(tiles[starts].tolist(), tiles[ends].tolist()):
+            src.topleft, src.w = ((a % tw) * t, (a // tw) * t), (b - a + 1) * t
+            dst.topleft, dst.w = (src.x * s, src.y * s), src.w * s
+            self.texture.draw(srcrect=src, dstrect=dst)
+        self.runs = len(starts)
+
+# --------------------- world clock ---------------------
+# Named time-scale factors (slow-mo, progress speed-up, pause...) multiplied into one
+# scalar. Entities scale their dt by it when they integrate, so a change is O(1).
+# A child clock also follows its parent, which gives per-layer clocks.
+class WorldClock:
+    def __init__(self, parent: Optional["WorldClock"] = None):
+        self.parent = parent
+        self.factors: Dict[str, float] = {}
+        self.local = 1.0
+
+    def set(self, name: str, value: float):
+        if value == 1.0: self.factors.pop(name, None)
+        else: self.factors[name] = value
+        self.local = 1.0
+        for v in self.factors.values(): self.local *= v
+
+    def clear(self):
+        self.factors.clear()
+        self.local = 1.0
+
+    @property
+    def scale(self) -> float:
+        return self.local * self.parent.scale if self.parent else self.local
+
+# pre-rendered stand-ins for missing sprites, so they batch like real images
+_FALLBACK_CACHE: Dict[tuple, pygame.Surface] = {}
+
+def fallback_item_image(good: bool, size: Tuple[int, int]) -> pygame.Surface:
+    key = ("item", good, size)
+    CACHE_STATS["fallbacks"][key not in _FALLBACK_CACHE] += 1
+    if key not in _FALLBACK_CACHE:
+        s = pygame.Surface(size, pygame.SRCALPHA)
+        r = s.get_rect()
+        pygame.draw.rect(s, GREEN if good else RED, r, border_radius=10)
+        if good:
+            pygame.draw.line(s, WHITE, (r.left+8, r.centery), (r.centerx-2, r.bottom-8), 4)
+            pygame.draw.line(s, WHITE, (r.centerx-2, r.bottom-8), (r.right-8, r.top+8), 4)
+        else:
+            pygame.draw.line(s, WHITE, (r.left+8, r.top+8), (r.right-8, r.bottom-8), 4)
+            pygame.draw.line(s, WHITE, (r.right-8, r.top+8), (r.left-8+r.w, r.bottom-8), 4)
+        _FALLBACK_CACHE[key] = s
+    return _FALLBACK_CACHE[key]
+
+def fallback_flying_image(good: bool, radius: int) -> pygame.Surface:
+    key = ("flying", good, radius)
+    CACHE_STATS["fallbacks"][key not in _FALLBACK_CACHE] += 1
+    if key not in _FALLBACK_CACHE:
+        s = pygame.Surface((radius*2 + 2, radius*2 + 2), pygame.SRCALPHA)
+        pygame.draw.circle(s, WHITE if good else RED, (radius + 1, radius + 1), radius, 2)
+        _FALLBACK_CACHE[key] = s
+    return _FALLBACK_CACHE[key]
+
+def fallback_powerup_image(kind: str, size: Tuple[int, int]) -> pygame.Surface:
+    key = ("powerup", kind, size)
+    CACHE_STATS["fallbacks"][key not in _FALLBACK_CACHE] += 1
+    if key not in _FALLBACK_CACHE:
+        s = pygame.Surface(size, pygame.SRCALPHA)
+        r = s.get_rect()
+        pu = POWERUPS.get(kind)
+        pygame.draw.rect(s, pu.color if pu else YELLOW, r, border_radius=10)
+        draw_text_center(pu.label if pu else "?", FONT_TINY, BLACK, s, r.centerx, r.centery)
+        _FALLBACK_CACHE[key] = s
+    return _FALLBACK_CACHE[key]
+
+# --------------------- split screen ---------------------
+# Movement keys (left, right, hint) per seat; a single session takes arrows and A/D.
+SOLO_KEYS = ((pygame.K_LEFT, pygame.K_a), (pygame.K_RIGHT, pygame.K_d), "arrows or A D")
+SEAT_KEYS = [((pygame.K_a,), (pygame.K_d,), "A D"), ((pygame.K_LEFT,), (pygame.K_RIGHT,), "arrows"),
+             ((pygame.K_j,), (pygame.K_l,), "J L"), ((pygame.K_KP4,), (pygame.K_KP6,), "keypad 4 6")]
+SPLIT_SURFACES: List[pygame.Surface] = []  # session targets and present() scratch, for the memory budget
+
+# 16:9 viewports in virtual frame coordinates, on the smallest grid that holds n
+def split_viewports(n: int) -> List[pygame.Rect]:
+    cols = math.ceil(math.sqrt(n))
+    rows = math.ceil(n / cols)
+    cw, ch = VIRTUAL_W // cols, VIRTUAL_H // rows
+    w = min(cw, ch * VIRTUAL_W // VIRTUAL_H)
+    h = w * VIRTUAL_H // VIRTUAL_W
+    return [pygame.Rect((i % cols) * cw + (cw - w) // 2, (i // cols) * ch + (ch - h) // 2, w, h) for i in range(n)]
+
 # --------------------- entities ---------------------
 class Girl:
-    def __init__(self, y):
+    def __init__(self, y, controls=SOLO_KEYS):
         self.w, self.h = 96, 192  # keep your chosen size
+        self.keys_left, self.keys_right, _ = controls
         self.x = VIRTUAL_W // 2 - self.w // 2
         self.y = y
         self.speed = 800
         self.frames: List[pygame.Surface] = []
         self.frames_big: List[pygame.Surface] = []
+        self.frames_left: List[pygame.Surface] = []
+        self.frames_big_left: List[pygame.Surface] = []
         self.use_big = False
         self.frame_index = 0
         self.anim_timer = 0.0
@@ -320,15 +1824,19 @@ class Girl:
             pygame.draw.rect(s2, WHITE, pygame.Rect(22, h//2-6, w-44, 12), border_radius=6)
             return [s1, s2]
 
-        a = load_image("girl_walk1.png", (self.w, self.h))
-        b = load_image("girl_walk2.png", (self.w, self.h))
+        a = get_item_image("girl_walk1.png", (self.w, self.h))
+        b = get_item_image("girl_walk2.png", (self.w, self.h))
         self.frames = [a, b] if a and b else fallback_pair(self.w, self.h, BLUE)
 
         big_w, big_h = 96, 192
-        a2 = load_image("girl_big_walk1.png", (big_w, big_h))
-        b2 = load_image("girl_big_walk2.png", (big_w, big_h))
+        a2 = get_item_image("girl_big_walk1.png", (big_w, big_h))
+        b2 = get_item_image("girl_big_walk2.png", (big_w, big_h))
         self.frames_big = [a2, b2] if a2 and b2 else fallback_pair(big_w, big_h, (70, 110, 255))
 
+        # flip once here, flipping per frame would also undo RLE on every draw
+        self.frames_left = [optimize_surface(pygame.transform.flip(f, True, False)) for f in self.frames]
+        self.frames_big_left = [optimize_surface(pygame.transform.flip(f, True, False)) for f in self.frames_big]
+
     def set_speed(self, v): self.speed = v
 
     def set_big_model(self, on: bool):
@@ -344,8 +1852,8 @@ class Girl:
 
     def update(self, dt, keys):
         dx = 0
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]: dx -= 1
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]: dx += 1
+        if any(keys[k] for k in self.keys_left): dx -= 1
+        if any(keys[k] for k in self.keys_right): dx += 1
         if dx < 0: self.facing_left = True
         elif dx > 0: self.facing_left = False
         self.x += dx * self.speed * dt
@@ -361,26 +1869,27 @@ class Girl:
 
     def rect(self): return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
 
-    def catch_rect(self, extra_width: int = 0):
-        r = self.rect().copy()
+    # (x, y, w, h) as floats, no Rect allocation
+    def catch_box(self, extra_width: int = 0):
+        x, w = self.x, self.w
         if extra_width > 0:
-            r.x -= extra_width // 2
-            r.w += extra_width
-            r.x = max(0, r.x)
-            r.w = min(VIRTUAL_W - r.x, r.w)
-        return r
+            x = max(0, x - extra_width // 2)
+            w = min(VIRTUAL_W - x, w + extra_width)
+        return x, self.y, w, self.h
 
-    def draw(self, surf):
-        frame = (self.frames_big if self.use_big else self.frames)[self.frame_index]
-        if self.facing_left: frame = pygame.transform.flip(frame, True, False)
-        surf.blit(frame, (int(self.x), int(self.y)))
+    def submit(self, rq: RenderQueue):
+        if self.facing_left:
+            frame = (self.frames_big_left if self.use_big else self.frames_left)[self.frame_index]
+        else:
+            frame = (self.frames_big if self.use_big else self.frames)[self.frame_index]
+        rq.submit(frame, (int(self.x), int(self.y)), LAYER_GIRL)
 
 class Printer:
-    def __init__(self, y, speed):
-        self.base_speed = speed
+    def __init__(self, y, speed, rng: random.Random = random):
         self.speed = speed
-        self.dir = random.choice([-1, 1])
-        self.image = load_image(PRINTER_IMAGE, PRINTER_SIZE)
+        self.rng = rng
+        self.dir = rng.choice([-1, 1])
+        self.image = get_item_image(PRINTER_IMAGE, PRINTER_SIZE)
         self.w, self.h = PRINTER_SIZE if self.image is None else (self.image.get_width(), self.image.get_height())
         self.x = VIRTUAL_W // 2 - self.w // 2
         self.y = y  # under the top bar
@@ -390,113 +1899,248 @@ class Printer:
         else:
             self.surface = None
 
-    def set_speed(self, v): self.base_speed = v; self.speed = v
-    def apply_slowmo(self, factor: float): self.speed = self.base_speed * factor
-    def clear_slowmo(self): self.speed = self.base_speed
+    def set_speed(self, v): self.speed = v
 
     def update(self, dt):
         self.x += self.dir * self.speed * dt
         if self.x <= 0: self.x, self.dir = 0, 1
         if self.x + self.w >= VIRTUAL_W: self.x, self.dir = VIRTUAL_W - self.w, -1
-        if random.random() < 0.004: self.dir *= -1
+        if self.rng.random() < 0.004: self.dir *= -1
 
     def rect(self): return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
     def centerx(self): return self.x + self.w * 0.5
     def slot_y(self): return self.y + self.h
-    def draw(self, surf):
-        if self.image: surf.blit(self.image, (int(self.x), int(self.y)))
-        else: surf.blit(self.surface, (int(self.x), int(self.y)))
+    def submit(self, rq: RenderQueue):
+        rq.submit(self.image or self.surface, (int(self.x), int(self.y)), LAYER_PRINTER)
 
 class Item:
-    def __init__(self, x, y, vy, size, good: bool, image: Optional[pygame.Surface] = None):
+    def __init__(self, x, y, vy, size, good: bool, image: Optional[pygame.Surface] = None, sprite_path: str = ""):
         self.x, self.y = x, y
-        self.base_vy = vy
-        self.vy = vy
+        self.sprite_path = sprite_path  # lets snapshots rebuild the item without the surface
+        self.vy = vy  # unscaled, the fall clock is applied in update
         self.w, self.h = size
         self.good = good
         self.color = GREEN if good else RED
-        self.image = image
-
-    def apply_slowmo(self, factor: float): self.vy = self.base_vy * factor
-    def clear_slowmo(self): self.vy = self.base_vy
-    def apply_progress_scale(self, scale: float): self.vy = self.base_vy * scale
+        self.image = image or fallback_item_image(good, size)
 
-    def update(self, dt, magnet_to_x: Optional[float] = None, magnet_power: float = 0.0):
+    def update(self, dt, fall_scale: float = 1.0, magnet_to_x: Optional[float] = None, magnet_power: float = 0.0):
         if magnet_to_x is not None and magnet_power > 0.0:
             dx = magnet_to_x - self.x
             self.x += dx * magnet_power * dt
-        self.y += self.vy * dt
+        self.y += self.vy * fall_scale * dt
 
     def rect(self): return pygame.Rect(int(self.x - self.w//2), int(self.y - self.h//2), self.w, self.h)
 
-    def draw(self, surf):
-        r = self.rect()
-        if self.image:
-            surf.blit(self.image, r.topleft)
+    def submit(self, rq: RenderQueue):
+        rq.submit(self.image, (int(self.x - self.w//2), int(self.y - self.h//2)), LAYER_ITEMS)
+
+# --------------------- ballistic arcs ---------------------
+ARC_EXIT_Y = VIRTUAL_H + 200  # thrown things are gone once they fall past this
+
+# seconds after launch until y0 + vy0*t + GRAVITY*t^2/2 passes limit (the falling root)
+def arc_exit_time(y0: float, vy0: float, limit: float = ARC_EXIT_Y) -> float:
+    c = y0 - limit
+    if c >= 0: return 0.0
+    return (-vy0 + (vy0 * vy0 - 2.0 * GRAVITY * c) ** 0.5) / GRAVITY
+
+# Live thrown entities moving on closed-form parabolas from their launch state, so
+# positions are exact at any frame rate. Launch values and the evaluated state live in
+# preallocated columns (numpy arrays, plain lists without numpy), one slot per arc,
+# swap-removed; evaluate() and hits() are one vectorised pass over all of them.
+# Entities only carry their slot, positions are read from the columns.
+# Exits are solved at launch and culled by popping a heap.
+ARC_X0, ARC_Y0, ARC_VX, ARC_VY0, ARC_T0, ARC_SPIN, ARC_R = range(7)
+ARC_X, ARC_Y, ARC_VY, ARC_ANG = range(4)
+
+class ArcSet:
+    def __init__(self, capacity: int = 64):
+        self.t = 0.0
+        self.live: list = []
+        self.exits: List[tuple] = []  # (t_exit, seq, entity), stale once the entity is removed
+        self.seq = 0
+        self.launch = self.state = None
+        self._grow(capacity)
+
+    def _grow(self, cap: int):
+        n = len(self.live)
+        if np is not None:
+            launch, state = np.zeros((7, cap)), np.zeros((4, cap))
+            if self.launch is not None:
+                launch[:, :n] = self.launch[:, :n]
+                state[:, :n] = self.state[:, :n]
         else:
-            pygame.draw.rect(surf, self.color, r, border_radius=10)
-            if self.good:
-                pygame.draw.line(surf, WHITE, (r.left+8, r.centery), (r.centerx-2, r.bottom-8), 4)
-                pygame.draw.line(surf, WHITE, (r.centerx-2, r.bottom-8), (r.right-8, r.top+8), 4)
-            else:
-                pygame.draw.line(surf, WHITE, (r.left+8, r.top+8), (r.right-8, r.bottom-8), 4)
-                pygame.draw.line(surf, WHITE, (r.right-8, r.top+8), (r.left-8+r.w, r.bottom-8), 4)
+            launch = [col[:n] + [0.0] * (cap - n) for col in (self.launch or [[]] * 7)]
+            state = [col[:n] + [0.0] * (cap - n) for col in (self.state or [[]] * 4)]
+        self.launch, self.state, self.cap = launch, state, cap
+
+    def __len__(self): return len(self.live)
+    def __iter__(self): return iter(self.live)
+
+    def clear(self):
+        for e in self.live: e.slot = None
+        self.live.clear()
+        self.exits.clear()
+        self.t = 0.0
+
+    def add(self, e, x: float, y: float, vx: float, vy: float, spin: float = 0.0, radius: float = 0.0):
+        i = len(self.live)
+        if i == self.cap: self._grow(self.cap * 2)
+        e.slot = i
+        self.live.append(e)
+        for col, v in zip(self.launch, (x, y, vx, vy, self.t, spin, radius)): col[i] = v
+        for col, v in zip(self.state, (x, y, vy, 0.0)): col[i] = v
+        self.seq += 1
+        heapq.heappush(self.exits, (self.t + arc_exit_time(y, vy), self.seq, e))
+
+    # swap-remove, the last arc takes the freed slot
+    def remove(self, e):
+        i = e.slot
+        if i is None: return
+        e.slot = None
+        last = self.live.pop()
+        if last is not e:
+            j = len(self.live)
+            for col in self.launch: col[i] = col[j]
+            for col in self.state: col[i] = col[j]
+            self.live[i] = last
+            last.slot = i
+
+    def advance(self, dt: float): self.t += dt
+
+    # removes and returns the arcs whose exit time has passed
+    def expire(self) -> list:
+        out = []
+        while self.exits and self.exits[0][0] <= self.t:
+            e = heapq.heappop(self.exits)[2]
+            if e.slot is None: continue
+            self.remove(e)
+            out.append(e)
+        return out
+
+    def evaluate(self):
+        n = len(self.live)
+        if not n: return
+        if np is not None:
+            x0, y0, vx, vy0, t0, spin, _ = self.launch[:, :n]
+            x, y, vy, ang = self.state[:, :n]  # views, written in place
+            tau = self.t - t0
+            np.multiply(vx, tau, out=x); x += x0
+            np.multiply(tau, GRAVITY, out=vy); vy += vy0
+            np.add(vy0, vy, out=y); y *= 0.5 * tau; y += y0
+            np.multiply(spin, tau, out=ang)
+            return
+        l, st = self.launch, self.state
+        for i in range(n):
+            tau = self.t - l[ARC_T0][i]
+            st[ARC_X][i] = l[ARC_X0][i] + l[ARC_VX][i] * tau
+            st[ARC_Y][i] = l[ARC_Y0][i] + l[ARC_VY0][i] * tau + 0.5 * GRAVITY * tau * tau
+            st[ARC_VY][i] = l[ARC_VY0][i] + GRAVITY * tau
+            st[ARC_ANG][i] = l[ARC_SPIN][i] * tau
+
+    # current (x, y, vx, vy) of one arc
+    def motion(self, e) -> Tuple[float, float, float, float]:
+        i = e.slot
+        return (float(self.state[ARC_X][i]), float(self.state[ARC_Y][i]),
+                float(self.launch[ARC_VX][i]), float(self.state[ARC_VY][i]))
+
+    # -> (xs, ys, angles) as lists in slot order, for the draw loop
+    def frame(self):
+        n = len(self.live)
+        if np is not None: return tuple(self.state[c, :n].tolist() for c in (ARC_X, ARC_Y, ARC_ANG))
+        return tuple(self.state[c][:n] for c in (ARC_X, ARC_Y, ARC_ANG))
+
+    # arcs whose circle (radius column) touches the polyline pts [(x, y, t), ...]
+    # -> [(entity, dx, dy)] with the direction of the last segment that touched it
+    def hits(self, pts) -> List[tuple]:
+        n = len(self.live)
+        if not n or len(pts) < 2: return []
+        if np is not None:
+            p = np.array([(x, y) for x, y, _ in pts], dtype=float)
+            a, d = p[:-1], p[1:] - p[:-1]
+            dd = (d * d).sum(1)
+            keep = dd > 0
+            a, d, dd = a[keep], d[keep], dd[keep]
+            if not len(dd): return []
+            x, y, r = self.state[ARC_X, :n], self.state[ARC_Y, :n], self.launch[ARC_R, :n]
+            ax, ay, dx, dy = a[:, 0, None], a[:, 1, None], d[:, 0, None], d[:, 1, None]  # segments down, arcs across
+            tp = np.clip(((x - ax) * dx + (y - ay) * dy) / dd[:, None], 0.0, 1.0)
+            m = (ax + tp * dx - x) ** 2 + (ay + tp * dy - y) ** 2 <= r * r
+            hit = np.flatnonzero(m.any(0))
+            seg = len(dd) - 1 - m[::-1, hit].argmax(0)  # last touching segment per hit arc
+            return [(self.live[i], float(d[k, 0]), float(d[k, 1])) for i, k in zip(hit.tolist(), seg.tolist())]
+        out = []
+        for i, e in enumerate(self.live):
+            cx, cy, r = self.state[ARC_X][i], self.state[ARC_Y][i], self.launch[ARC_R][i]
+            hit = None
+            for (x1, y1, _), (x2, y2, _) in zip(pts, pts[1:]):
+                dx, dy = x2 - x1, y2 - y1
+                if dx == 0 and dy == 0: continue
+                tproj = max(0, min(1, ((cx - x1) * dx + (cy - y1) * dy) / (dx * dx + dy * dy)))
+                if (x1 + tproj * dx - cx) ** 2 + (y1 + tproj * dy - cy) ** 2 <= r * r: hit = (dx, dy)
+            if hit: out.append((e, hit[0], hit[1]))
+        return out
 
 # --------------------- special level entities ---------------------
+# position and motion live in the ArcSet columns, see ArcSet.motion / frame
 class FlyingItem:
-    def __init__(self, img: Optional[pygame.Surface], x: float, y: float, vx: float, vy: float, good: bool):
+    def __init__(self, img: Optional[pygame.Surface], good: bool, sprite_path: str = ""):
         self.img = img
-        self.x, self.y = x, y
-        self.vx, self.vy = vx, vy
+        self.sprite_path = sprite_path
+        self.slot = None
         self.good = good
-        self.alive = True
         if img:
             self.w, self.h = img.get_size()
             self.radius = max(self.w, self.h) * 0.5
         else:
             self.w = self.h = 40
             self.radius = 22
+        self.sprite = img or fallback_flying_image(good, int(self.radius))
+        self.half_w, self.half_h = self.sprite.get_width() / 2, self.sprite.get_height() / 2
 
-    def update(self, dt):
-        self.vy += 1400 * dt  # gravity
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        if self.y > VIRTUAL_H + 200:
-            self.alive = False
-
-    def draw(self, surf):
-        if self.img:
-            surf.blit(self.img, (int(self.x - self.w/2), int(self.y - self.h/2)))
-        else:
-            pygame.draw.circle(surf, WHITE if self.good else RED, (int(self.x), int(self.y)), int(self.radius), 2)
+    def submit(self, rq: RenderQueue, x: float, y: float, ang: float):
+        rq.submit(self.sprite, (int(x - self.half_w), int(y - self.half_h)), LAYER_ITEMS)
 
 class SlicedPiece:
-    def __init__(self, surf: pygame.Surface, cx: float, cy: float, vx: float, vy: float):
+    def __init__(self, surf: pygame.Surface):
         self.surf = surf
-        self.cx = cx
-        self.cy = cy
-        self.vx = vx
-        self.vy = vy
-        self.ang = 0.0
-        self.ang_vel = random.uniform(-220, 220)
-        self.alive = True
-
-    def update(self, dt: float):
-        self.vy += 1400 * dt
-        self.cx += self.vx * dt
-        self.cy += self.vy * dt
-        self.ang += self.ang_vel * dt
-        if self.cy > VIRTUAL_H + 200:
-            self.alive = False
+        self.slot = None
 
-    def draw(self, surf: pygame.Surface):
-        img = pygame.transform.rotate(self.surf, self.ang)
-        rect = img.get_rect(center=(int(self.cx), int(self.cy)))
-        surf.blit(img, rect.topleft)
+    def submit(self, rq: RenderQueue, x: float, y: float, ang: float):
+        rect = self.surf.get_rect(center=(int(x), int(y)))
+        rq.submit_xform(self.surf, rect, ang, LAYER_PIECES)
 
 # --------------------- game core ---------------------
 class Game:
-    def __init__(self):
+    # One play session. The first one (host None) also owns the window, pacing and the shared
+    # services; with POLUTIO_SESSIONS > 1 it creates the other seats, which borrow all of that.
+    def __init__(self, host: Optional["Game"] = None, index: int = 0, viewport: Optional[pygame.Rect] = None):
+        views = split_viewports(SESSIONS) if host is None and SESSIONS > 1 else None
+        self.index = index
+        self.viewport = views[0] if views else viewport  # None: the whole frame
+        self.owns_music = index == 0
+        self.controls = SOLO_KEYS if self.viewport is None else SEAT_KEYS[index]
+        # split sessions draw into their own target at the size they are shown at, see fit_target
+        self.target = GAME_SURF if self.viewport is None else make_opaque_surface(self.viewport.size)
+        if self.viewport is not None: SPLIT_SURFACES.append(self.target)
+        self.focus = 0        # seat the menu keys (Esc, P, Backspace) go to
+        self.rng = random.Random()
+        if host is None:
+            self.telemetry = Telemetry()
+            self.pacer = FramePacer()
+            self.stats_server = StatsServer()
+            self.profiler = FrameProfiler()
+            self.runs = RunStore()
+            if hasattr(signal, "SIGUSR1"):  # not on Windows
+                try: signal.signal(signal.SIGUSR1, self.profiler.request)
+                except ValueError: pass  # only the main thread may install handlers
+        else:
+            self.telemetry, self.pacer, self.stats_server = host.telemetry, host.pacer, host.stats_server
+            self.profiler, self.runs = host.profiler, host.runs
+        self.powerups_used: Dict[str, int] = {}
+        self.board_level = 0
+        self.board_rows: List[dict] = []
+        self.stats_next = 0.0
+        self.frame_ms = deque(maxlen=PACER_HISTORY)  # update+draw+present work per rendered frame
         self.state = "MAIN_MENU"
         self.level_index = 0
         self.level = LEVELS[0]
@@ -505,63 +2149,267 @@ class Game:
         self.time_left = self.level.time_limit_s
         self.items: List[Item] = []
         self.powerups: List[PowerUpDrop] = []
-        self.active_timers: Dict[str, float] = {}
+        self.sim_time = 0.0  # seconds of play in the current level
+        self.active_until: Dict[str, float] = {}  # kind -> sim_time it ends
+        self.pu_heap: List[Tuple[float, str]] = []  # (ends_at, kind), may hold stale entries
+        self.badge_order: List[str] = []  # active kinds, kept sorted for the top bar
         self.double_gain = False
         self.magnet = False
-        self.slowmo = False
 
-        self.spawn_timer = 0.0
-        self.powerup_timer = 0.0
+        # world runs at world_clock.scale, falling things additionally at fall_clock's
+        self.world_clock = WorldClock()
+        self.fall_clock = WorldClock(self.world_clock)
+
+        self.schedule = SpawnSchedule(self.level, self.rng.getrandbits(32))
 
-        self.girl = Girl(VIRTUAL_H - 160)
+        self.girl = Girl(VIRTUAL_H - 160, self.controls)
         self.girl.set_speed(self.level.girl_speed)
-        self.printer = Printer(TOP_BAR_H + 8, self.level.printer_speed)
+        self.printer = Printer(TOP_BAR_H + 8, self.level.printer_speed, self.rng)
 
         self.caught_good = 0
         self.caught_bad = 0
         self.result_text = ""
         self.mouse_down_last = False
 
+        # idle / focus tracking for the main loop
+        self.focused = True
+        self.minimized = False
+        self.drawn_state = None
+        self.skip_dt = False
+        self.user_paused = False
+
+        # snapshots: level start for instant retry, a short history for rewind
+        self.start_snapshot: Optional[dict] = None
+        self.rewind_buf = deque(maxlen=int(REWIND_S / REWIND_EVERY_S))
+        self.rewind_timer = 0.0
+        self.has_resume = self.viewport is None and os.path.isfile(RESUME_FILE)  # resume is single-player only
+
         # background caching
-        self.bg_images: List[Optional[pygame.Surface]] = [None]*6
+        self.bg: Optional[BackgroundStore] = None
         self.bg_stage_index = -1
         self.load_bg_assets()
         self.update_bg_stage(force=True)
 
         # --- special level runtime ---
-        self.special_items: List[FlyingItem] = []
-        self.special_spawn_timer = 0.0
-        self.slice_points: List[Tuple[float, float, float]] = []  # (x,y,time)
-        self.special_pieces: List[SlicedPiece] = []
+        self.special_items = ArcSet()   # FlyingItem
+        self.slice_points = deque(maxlen=SWIPE_MAX_SAMPLES)  # (x,y,time)
+        self.special_pieces = ArcSet()  # SlicedPiece
+        self.swipe = SwipeCapture(to_local=self.to_local)
+
+        # split sessions blit in software into their targets, textures only come in at present()
+        self.rq = RenderQueue(TEXTURES if self.viewport is None else None)
+        self.particles = ParticleSystem()
+
+        self.sessions = [self]
+        if views: self.sessions += [Game(self, i, vp) for i, vp in enumerate(views) if i > 0]
 
     # ---------- backgrounds ----------
     def load_bg_assets(self):
-        self.bg_images = []
-        for stage in self.level.backgrounds:
-            img = load_image(stage.image_path, (VIRTUAL_W, VIRTUAL_H)) if stage.image_path else None
-            self.bg_images.append(img)
+        old = self.bg  # acquired first, so restarting the same level keeps its store
+        self.bg = acquire_backgrounds(self.level, self.get_stage_blend_for_progress(), self)
+        if old is not None and old is not self.bg: release_backgrounds(old, self)
+        if self.bg is not old:
+            self.telemetry.event("bg_build", level=self.level.name, build_ms=self.bg.build_ms,
+                                 blend_build_ms=round(self.bg.blend_ms, 2))
 
     def get_stage_index_for_progress(self) -> int:
-        thresholds = [0, 20, 40, 60, 80, 100]
         idx = 0
-        for i, t in enumerate(thresholds):
+        for i, t in enumerate(STAGE_THRESHOLDS):
             if self.progress >= t: idx = i
         return idx
 
+    # continuous stage position, e.g. 1.5 is halfway from stage 1 to stage 2
+    def get_stage_blend_for_progress(self) -> float:
+        p = max(0, min(100, self.progress))
+        pos = 0.0
+        for t in STAGE_THRESHOLDS[1:]:
+            pos += max(0.0, min(1.0, (p - (t - BG_BLEND_SPAN / 2)) / BG_BLEND_SPAN))
+        return min(pos, len(self.level.backgrounds) - 1)
+
     def update_bg_stage(self, force=False):
+        self.bg.update(self.get_stage_blend_for_progress(), self)
         idx = self.get_stage_index_for_progress()
         if force or idx != self.bg_stage_index:
             self.bg_stage_index = idx
+            self.telemetry.event("stage", stage=idx, progress=self.progress, bg_bytes=self.bg.resident_bytes())
             stage = self.level.backgrounds[idx]
-            safe_music_load_and_play(stage.sound_path)
+            if self.owns_music: safe_music_load_and_play(stage.sound_path)
+
+    # -> (stage index, image or None); blend frames are BG_BLEND_SCALE times smaller
+    def background_frame(self):
+        pos = self.get_stage_blend_for_progress()
+        idx = int(pos)
+        k = int(round((pos - idx) * (BG_BLEND_STEPS + 1)))
+        if k == BG_BLEND_STEPS + 1:
+            idx, k = idx + 1, 0
+        if k > 0:
+            frame = self.bg.blend(idx, k)
+            if frame is not None: return idx, frame
+            if k > BG_BLEND_STEPS // 2: idx += 1  # fade not built (over budget): cut at the midpoint
+        return idx, self.bg.image(idx)
 
     def draw_background(self, surf):
-        idx = self.get_stage_index_for_progress()
-        img = self.bg_images[idx]
-        if img:
+        idx, img = self.background_frame()
+        if img is None:
+            surf.fill(self.level.backgrounds[idx].fallback_color)
+        elif img.get_size() == surf.get_size():
             surf.blit(img, (0, 0))
         else:
-            surf.fill(self.level.backgrounds[idx].fallback_color)
+            pygame.transform.scale(img, surf.get_size(), surf)
+
+    # texture backend with no image for the stage: a renderer fill instead of an overlay
+    def fill_background(self, renderer):
+        idx, _ = self.background_frame()
+        renderer.draw_color = pygame.Color(self.level.backgrounds[idx].fallback_color)
+        renderer.fill_rect(pygame.Rect(0, 0, VIRTUAL_W, VIRTUAL_H))
+
+    def submit_background(self, rq: RenderQueue):
+        idx, img = self.background_frame()
+        if img is None or (rq.backend is None and self.viewport is None):
+            rq.submit_call(self.draw_background, LAYER_BACKGROUND, gpu=self.fill_background)  # software scales straight into the target
+        else:
+            rq.submit_xform(img, pygame.Rect(0, 0, VIRTUAL_W, VIRTUAL_H), 0.0, LAYER_BACKGROUND)
+
+    # ---------- snapshots ----------
+    # Plain lists/dicts only, so it can go through json as is. Sliced halves and
+    # particles are cosmetic and left out; sprites are stored by path.
+    def snapshot(self, rng: bool = True) -> dict:
+        g, p = self.girl, self.printer
+        snap = {
+            "v": SNAPSHOT_VERSION, "level": self.level_index, "state": self.state,
+            "progress": self.progress, "time_left": self.time_left, "sim_time": self.sim_time,
+            "schedule": self.schedule.state(),
+            "caught": [self.caught_good, self.caught_bad],
+            "used": dict(self.powerups_used),
+            "clock": dict(self.world_clock.factors),
+            "active": dict(self.active_until),
+            "girl": [g.x, g.y, g.use_big, g.facing_left, g.frame_index, g.anim_timer],
+            "printer": [p.x, p.dir, p.speed],
+            "items": [[it.x, it.y, it.vy, it.good, it.sprite_path] for it in self.items],
+            "powerups": [[pu.x, pu.y, pu.vy, pu.kind] for pu in self.powerups],
+            "special": [[*self.special_items.motion(it), it.good, it.sprite_path] for it in self.special_items],
+        }
+        if rng: snap["rng"] = self.rng.getstate()
+        return snap
+
+    # Reuses the loaded girl, printer and backgrounds; only a level change reloads anything.
+    def restore(self, snap: dict, rng: bool = True):
+        if snap.get("v") != SNAPSHOT_VERSION: raise ValueError("unsupported snapshot version")
+        if snap["level"] != self.level_index or self.bg is None:
+            self.level_index = snap["level"]
+            self.level = LEVELS[self.level_index]
+            self.load_bg_assets()
+            self.girl.set_speed(self.level.girl_speed)
+            self.printer.set_speed(self.level.printer_speed)
+        size = self.level.item_size
+        self.state = snap["state"]
+        self.result_text = ""
+        self.progress = snap["progress"]
+        self.time_left = snap["time_left"]
+        self.sim_time = snap["sim_time"]
+        if rng:
+            self.schedule = SpawnSchedule.from_state(self.level, snap["schedule"])
+        else:  # same spot in the level, but a fresh timeline ahead of it
+            self.schedule = SpawnSchedule(self.level, self.rng.getrandbits(32))
+            self.schedule.advance(snap["schedule"][1])
+            for name in self.schedule.rows: self.schedule.due(name)
+        self.caught_good, self.caught_bad = snap["caught"]
+        self.powerups_used = dict(snap.get("used", {}))
+        self.world_clock.clear()
+        for name, v in snap["clock"].items(): self.world_clock.set(name, v)
+        self.active_until = {k: float(v) for k, v in snap["active"].items()}
+        self.pu_heap = [(v, k) for k, v in self.active_until.items()]
+        heapq.heapify(self.pu_heap)
+        self.badge_order = sorted(self.active_until)
+        # timed effects are whatever their registry entry sets, so they follow from "active"
+        for kind, pu in POWERUPS.items():
+            if pu.timed: (pu.apply if kind in self.active_until else pu.expire)(self)
+
+        gx, gy, big, facing, frame, anim = snap["girl"]
+        self.girl.set_big_model(big)
+        self.girl.x, self.girl.y = gx, gy
+        self.girl.facing_left, self.girl.frame_index, self.girl.anim_timer = facing, frame, anim
+        self.printer.x, self.printer.dir, self.printer.speed = snap["printer"]
+
+        self.items = [Item(x, y, vy, size, good, get_item_image(path, size), path)
+                      for x, y, vy, good, path in snap["items"]]
+        self.powerups = [PowerUpDrop(x, y, vy, kind) for x, y, vy, kind in snap["powerups"]]
+        self.special_items.clear()  # relaunched from their current state
+        for x, y, vx, vy, good, path in snap["special"]:
+            it = FlyingItem(get_item_image(path, size), good, path)
+            self.special_items.add(it, x, y, vx, vy, radius=it.radius)
+        self.special_pieces.clear()
+        self.slice_points.clear()
+        self.swipe.reset()
+        self.particles.clear()
+        self.rq.begin()
+        if rng and "rng" in snap:
+            version, internal, gauss = snap["rng"]
+            self.rng.setstate((version, tuple(internal), gauss))
+        # music restarts if the stage differs, or if nothing is playing (e.g. resumed from the menu)
+        self.update_bg_stage(force=not pygame.mixer.music.get_busy())
+        self.user_paused = False
+        self.skip_dt = True
+
+    def save_snapshot(self, path: str) -> bool:
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, separators=(",", ":"))
+            return True
+        except (OSError, TypeError):
+            return False
+
+    def load_snapshot(self, path: str) -> bool:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.restore(json.load(f))
+            self.rewind_buf.clear()
+            return True
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            return False
+
+    def record_rewind(self, dt: float):
+        self.rewind_timer += dt
+        if self.rewind_timer >= REWIND_EVERY_S:
+            self.rewind_timer -= REWIND_EVERY_S
+            self.rewind_buf.append(self.snapshot())
+
+    def rewind(self):
+        if self.rewind_buf:
+            self.restore(self.rewind_buf[0])
+            self.rewind_buf.clear()
+            self.rewind_timer = 0.0
+
+    def retry_level(self):
+        # same start state, but the RNG keeps going so the run isn't a replay
+        if self.start_snapshot is None or self.start_snapshot["level"] != self.level_index:
+            self.start_level(self.level_index)
+            return
+        self.telemetry.event("level_start", level=self.level.name, retry=True)
+        self.restore(self.start_snapshot, rng=False)
+        self.rewind_buf.clear()
+        self.rewind_timer = 0.0
+
+    def set_user_paused(self, on: bool):
+        if on == self.user_paused: return
+        self.user_paused = on
+        if on:
+            if self.owns_music: pygame.mixer.music.pause()
+        else:
+            if self.owns_music: pygame.mixer.music.unpause()
+            self.skip_dt = True
+
+    def resume_saved(self):
+        ok = self.load_snapshot(RESUME_FILE)
+        self.discard_resume()
+        if not ok: self.state = "LEVEL_SELECT"
+
+    # a saved run is offered once: gone when it is resumed, or when any single-player run ends
+    def discard_resume(self):
+        if self.viewport is not None: return  # split seats never save one
+        try: os.remove(RESUME_FILE)
+        except OSError: pass
+        self.has_resume = False
 
     # ---------- helpers ----------
     def reset_level_runtime(self):
@@ -569,16 +2417,18 @@ class Game:
         self.time_left = self.level.time_limit_s
         self.items.clear()
         self.powerups.clear()
-        self.active_timers.clear()
+        self.clear_powerups()
+        self.sim_time = 0.0
+        self.powerups_used = {}
         self.double_gain = False
         self.magnet = False
-        self.slowmo = False
-        self.spawn_timer = 0.0
-        self.powerup_timer = 0.0
-        self.girl = Girl(VIRTUAL_H - 160)
+        self.world_clock.clear()
+        self.fall_clock.clear()
+        self.schedule = SpawnSchedule(self.level, self.rng.getrandbits(32))
+        self.girl = Girl(VIRTUAL_H - 160, self.controls)
         self.girl.set_speed(self.level.girl_speed)
         self.girl.set_big_model(False)
-        self.printer = Printer(TOP_BAR_H + 8, self.level.printer_speed)
+        self.printer = Printer(TOP_BAR_H + 8, self.level.printer_speed, self.rng)
         self.caught_good = 0
         self.caught_bad = 0
         self.result_text = ""
@@ -588,107 +2438,81 @@ class Game:
 
         # special reset
         self.special_items.clear()
-        self.special_spawn_timer = 0.0
         self.slice_points.clear()
         self.special_pieces.clear()
+        self.swipe.reset()
+        self.rq.begin()
+        self.particles.clear()
+        self.user_paused = False
 
     def progress_fall_scale(self) -> float:
         k = self.level.fall_scale_k
         return 1.0 + k * (max(0, min(100, self.progress)) / 100.0)
 
-    def _activate(self, kind: str, duration: float):
-        self.active_timers[kind] = duration
-        if kind == PU_DOUBLE_PCT:
-            self.double_gain = True
-        elif kind == PU_BIGGER_BASKET:
-            self.girl.set_big_model(True)
-        elif kind == PU_MAGNET:
-            self.magnet = True
-        elif kind == PU_STOPWATCH:
-            self.slowmo = True
-            self._apply_slowmo(True)
-
-    def _deactivate(self, kind: str):
-        if kind in self.active_timers: del self.active_timers[kind]
-        if kind == PU_DOUBLE_PCT:
-            self.double_gain = False
-        elif kind == PU_BIGGER_BASKET:
-            self.girl.set_big_model(False)
-        elif kind == PU_MAGNET:
-            self.magnet = False
-        elif kind == PU_STOPWATCH:
-            self.slowmo = False
-            self._apply_slowmo(False)
-
-    def _apply_slowmo(self, on: bool):
-        if on:
-            factor = self.level.slowmo_factor
-            self.printer.apply_slowmo(factor)
-            for it in self.items: it.apply_slowmo(factor)
-        else:
-            self.printer.clear_slowmo()
-            for it in self.items: it.clear_slowmo()
-
     # ---------- spawning (normal) ----------
-    def spawn_item(self):
+    def spawn_item(self, good: bool, sprite_path: str, vy: float):
         if len(self.items) >= self.level.max_items: return
-        good = random.random() < self.level.good_prob
-        base_vy = random.uniform(*self.level.fall_speed_range)
-        vy = base_vy * self.progress_fall_scale()
-        if self.slowmo: vy *= self.level.slowmo_factor
         x = self.printer.centerx()
         y = self.printer.slot_y()
-        # yeah
-        # pick sprite from shared lists
-        if good and GOOD_ITEM_FILES:
-            sprite_path = random.choice(GOOD_ITEM_FILES)
-        elif not good and BAD_ITEM_FILES:
-            sprite_path = random.choice(BAD_ITEM_FILES)
-        else:
-            sprite_path = ""
         sprite_img = get_item_image(sprite_path, self.level.item_size)
 
-        it = Item(x, y+10, vy, self.level.item_size, good, sprite_img)
-        it.base_vy = base_vy
-        it.apply_progress_scale(self.progress_fall_scale() * (self.level.slowmo_factor if self.slowmo else 1.0))
-        self.items.append(it)
+        self.items.append(Item(x, y+10, vy, self.level.item_size, good, sprite_img, sprite_path))
+        self.telemetry.event("spawn", good=good, x=round(x), vy=round(vy))
 
-    def spawn_powerup(self):
-        kinds = [PU_MORE_TIME, PU_LESS_TIME, PU_BIGGER_BASKET, PU_LESS_PCT, PU_MORE_PCT, PU_DOUBLE_PCT, PU_MAGNET, PU_STOPWATCH]
-        base_vy = random.uniform(*self.level.fall_speed_range) * 0.9
-        vy = base_vy * self.progress_fall_scale()
-        if self.slowmo: vy *= self.level.slowmo_factor
+    def spawn_powerup(self, kind: str, vy: float):
+        if kind not in POWERUPS: return
         x = self.printer.centerx()
         y = self.printer.slot_y()
-        self.powerups.append(PowerUpDrop(x, y+12, vy, random.choice(kinds)))
+        self.powerups.append(PowerUpDrop(x, y+12, vy, kind))
+        self.telemetry.event("spawn_pu", kind=kind, x=round(x))
 
     # ---------- powerup apply ----------
     def apply_powerup(self, kind: str):
-        dur = float(self.level.powerup_duration_s)
-        if kind == PU_MORE_TIME:
-            self.time_left += 5.0
-            self.active_timers[kind] = 1.0
-        elif kind == PU_LESS_TIME:
-            self.time_left = max(0.0, self.time_left - 5.0)
-            self.active_timers[kind] = 1.0
-        elif kind == PU_BIGGER_BASKET:
-            self._activate(PU_BIGGER_BASKET, dur)
-        elif kind == PU_LESS_PCT:
-            self.progress = max(0, self.progress - 2)
-            self.active_timers[kind] = 1.0
-        elif kind == PU_MORE_PCT:
-            self.progress = min(100, self.progress + 5)
-            self.active_timers[kind] = 1.0
-        elif kind == PU_DOUBLE_PCT:
-            self._activate(PU_DOUBLE_PCT, 5.0)
-        elif kind == PU_MAGNET:
-            self._activate(PU_MAGNET, dur)
-        elif kind == PU_STOPWATCH:
-            self._activate(PU_STOPWATCH, dur)
+        pu = POWERUPS[kind]
+        active = kind in self.active_until
+        if pu.timed:
+            dur = pu.duration_s if pu.duration_s is not None else float(self.level.powerup_duration_s)
+            if not active: pu.apply(self)
+        else:
+            dur = INSTANT_BADGE_S
+            pu.apply(self)
+        if active and pu.stacking == STACK_EXTEND:
+            until = self.active_until[kind] + dur
+        else:
+            until = self.sim_time + dur
+        if not active: bisect.insort(self.badge_order, kind)
+        self.active_until[kind] = until
+        heapq.heappush(self.pu_heap, (until, kind))
+        self.powerups_used[kind] = self.powerups_used.get(kind, 0) + 1
+        self.telemetry.event("powerup", kind=kind, refresh=active, until=round(until, 2))
+
+    # pops only what is due, so the cost is per expiry, not per active effect
+    def tick_powerups(self):
+        heap = self.pu_heap
+        while heap and heap[0][0] <= self.sim_time:
+            until, kind = heapq.heappop(heap)
+            if self.active_until.get(kind) != until: continue  # refreshed since, stale entry
+            self._expire_powerup(kind)
+
+    def _expire_powerup(self, kind: str):
+        del self.active_until[kind]
+        self.badge_order.remove(kind)
+        pu = POWERUPS[kind]
+        if pu.expire: pu.expire(self)
+
+    def clear_powerups(self):
+        for kind in list(self.active_until): self._expire_powerup(kind)
+        self.pu_heap.clear()
 
     # ---------- input ----------
+    # frame position -> this session's virtual coordinates (outside 0..VIRTUAL_* when off its viewport)
+    def to_local(self, pos):
+        vp = self.viewport
+        if vp is None: return pos
+        return (pos[0] - vp.x) * VIRTUAL_W // vp.w, (pos[1] - vp.y) * VIRTUAL_H // vp.h
+
     def handle_click(self, rects_with_actions):
-        mouse = mouse_pos_virtual()
+        mouse = self.to_local(mouse_pos_virtual())
         mouse_pressed = pygame.mouse.get_pressed()[0]
         clicked = False
         if self.mouse_down_last and not mouse_pressed:
@@ -699,6 +2523,11 @@ class Game:
         return clicked
 
     # ---------- UI drawing ----------
+    # everything draw_top_bar shows, so an unchanged bar isn't redrawn or re-uploaded
+    def top_bar_key(self) -> tuple:
+        badges = tuple((k, round(self.active_until[k] - self.sim_time, 1)) for k in self.badge_order)
+        return self.progress, max(0, int(self.time_left)), badges, self.user_paused
+
     def draw_top_bar(self, surf):
         pygame.draw.rect(surf, BLACK, pygame.Rect(0, 0, VIRTUAL_W, TOP_BAR_H))
 
@@ -719,305 +2548,285 @@ class Game:
 
         # powerup badges right
         badge_x = VIRTUAL_W - 16
-        for kind, seconds in sorted(self.active_timers.items()):
-            if kind in INSTANT_PUS and seconds <= 0: continue
+        for kind in self.badge_order:
+            seconds = self.active_until[kind] - self.sim_time
+            pu = POWERUPS[kind]
             w, h = 44, 44
             r = pygame.Rect(badge_x - w, TOP_BAR_H//2 - h//2, w, h)
-            icon = load_image(POWERUP_ICONS.get(kind, ""), (w, h))
+            icon = get_item_image(pu.icon, (w, h))
             if icon: surf.blit(icon, r.topleft)
             else:
-                col = {
-                    PU_MORE_TIME: GREEN, PU_LESS_TIME: RED, PU_BIGGER_BASKET: GOLD,
-                    PU_LESS_PCT: MAGENTA, PU_MORE_PCT: CYAN, PU_DOUBLE_PCT: ORANGE,
-                    PU_MAGNET: (100, 200, 255), PU_STOPWATCH: PURPLE
-                }.get(kind, YELLOW)
-                pygame.draw.rect(surf, col, r, border_radius=10)
-                short = {
-                    PU_MORE_TIME: "+5s", PU_LESS_TIME: "-5s", PU_BIGGER_BASKET: "B",
-                    PU_LESS_PCT: "-2", PU_MORE_PCT: "+5", PU_DOUBLE_PCT: "x2",
-                    PU_MAGNET: "M", PU_STOPWATCH: "S"
-                }.get(kind, "?")
-                draw_text_center(short, FONT_SM, BLACK, surf, r.centerx, r.centery)
-            label = f"{seconds:.1f}s" if kind in TIMED_PUS else f"{seconds:.1f}s"
+                pygame.draw.rect(surf, pu.color, r, border_radius=10)
+                draw_text_center(pu.badge, FONT_SM, BLACK, surf, r.centerx, r.centery)
+            label = f"{seconds:.1f}s"
             txt = FONT_TINY.render(label, True, WHITE)
             surf.blit(txt, (r.centerx - txt.get_width()//2, r.bottom + 2))
             badge_x -= w + 10
 
+    def end_level(self, result_text: str):
+        self.result_text = result_text
+        self.state = "GAME_OVER"
+        self.discard_resume()
+        self.telemetry.event("result", level=self.level.name, result=result_text, progress=self.progress,
+                             good=self.caught_good, bad=self.caught_bad, time_left=round(self.time_left, 2))
+        self.runs.record(self.level.name, result_text, self.progress, self.sim_time,
+                         self.caught_good, self.caught_bad, dict(self.powerups_used))
+
     # ---------- core loop: normal playing ----------
     def update_playing(self, dt):
         # timer
         self.time_left -= dt
         if self.time_left <= 0:
             self.time_left = 0
-            self.result_text = "Time up"
-            self.state = "GAME_OVER"
+            self.end_level("Time up")
             return
 
         # stage change by progress
         self.update_bg_stage(force=False)
+        rq = self.rq
+        rq.begin()
 
         # tick powerups
-        expired = []
-        for kind in list(self.active_timers.keys()):
-            self.active_timers[kind] -= dt
-            if self.active_timers[kind] <= 0: expired.append(kind)
-        for k in expired: self._deactivate(k)
+        self.sim_time += dt
+        self.tick_powerups()
+
+        # one fall scale for this frame: progress speed-up composed with slow-mo etc.
+        self.fall_clock.set("progress", self.progress_fall_scale())
+        world_dt = dt * self.world_clock.scale
+        fall_scale = self.fall_clock.scale
 
+        extra = self.level.basket_expand_px if self.girl.use_big else 0
+        gx0, gy0, _, _ = self.girl.catch_box(extra)
         keys = pygame.key.get_pressed()
         self.girl.update(dt, keys)
-        self.printer.update(dt)
-
-        # spawn
-        self.spawn_timer += dt * 1000
-        if self.spawn_timer >= self.level.spawn_interval_ms:
-            self.spawn_timer = 0
-            self.spawn_item()
-
-        self.powerup_timer += dt * 1000
-        if self.powerup_timer >= self.level.powerup_interval_ms:
-            self.powerup_timer = 0
-            if random.random() < self.level.powerup_drop_prob:
-                self.spawn_powerup()
-
-        # rescale item velocities with current progress and slowmo
-        scale_now = self.progress_fall_scale() * (self.level.slowmo_factor if self.slowmo else 1.0)
-        for it in self.items:
-            it.apply_progress_scale(scale_now)
-
-        # collisions
-        extra = self.level.basket_expand_px if self.girl.use_big else 0
-        catch_rect = self.girl.catch_rect(extra)
-        magnet_target_x = self.girl.rect().centerx if self.magnet else None
+        self.printer.update(world_dt)
+
+        # spawn: walk the pregenerated timeline up to the spawn clock
+        self.schedule.advance(dt)
+        for _, good, path, vy in self.schedule.due("items"): self.spawn_item(good, path, vy)
+        for _, kind, vy in self.schedule.due("powerups"): self.spawn_powerup(kind, vy)
+
+        # collisions are swept: item motion relative to the girl over the whole frame,
+        # so fast items can't skip past her on a long frame
+        gx, gy, gw, gh = self.girl.catch_box(extra)
+        gdx, gdy = gx - gx0, gy - gy0
+        magnet_target_x = self.girl.x + self.girl.w // 2 if self.magnet else None
         magnet_power = 4.5 if self.magnet else 0.0
 
         # items
         for it in list(self.items):
-            it.update(dt, magnet_target_x, magnet_power)
-            if it.rect().colliderect(catch_rect):
+            px, py = it.x, it.y
+            it.update(dt, fall_scale, magnet_target_x, magnet_power)
+            if swept_aabb_overlap(px - it.w//2, py - it.h//2, it.w, it.h,
+                                  it.x - px - gdx, it.y - py - gdy, gx0, gy0, gw, gh):
                 if it.good:
                     gain = 1
                     if self.double_gain: gain *= 2
                     self.progress = min(100, self.progress + gain)
                     self.caught_good += 1
+                    self.telemetry.event("catch", good=True, progress=self.progress)
+                    self.particles.emit(it.x, it.y, 24, GOLD, speed=(180, 520), angle=(-3.1416, 0.0), life=(0.25, 0.6))
                 else:
                     self.progress = max(0, self.progress - 1)
                     self.caught_bad += 1
+                    self.telemetry.event("catch", good=False, progress=self.progress)
+                    self.particles.emit(it.x, it.y, 24, RED, speed=(180, 520), angle=(-3.1416, 0.0), life=(0.25, 0.6))
                 self.items.remove(it)
             elif it.y - it.h > VIRTUAL_H:
                 if it.good:
                     self.progress = max(0, self.progress - 1)  # penalty for missed good fruit
+                    self.telemetry.event("miss", progress=self.progress)
+                    self.particles.emit(it.x, VIRTUAL_H - 4, 30, GREEN, speed=(250, 650), angle=(-2.7, -0.45), life=(0.3, 0.6))
                 self.items.remove(it)
+            else:
+                it.submit(rq)
 
         # powerups
         for pu in list(self.powerups):
-            pu.update(dt)
-            if pu.rect().colliderect(catch_rect):
+            py = pu.y
+            pu.update(dt * fall_scale)
+            if swept_aabb_overlap(pu.x - pu.w//2, py - pu.h//2, pu.w, pu.h,
+                                  -gdx, pu.y - py - gdy, gx0, gy0, gw, gh):
                 self.apply_powerup(pu.kind)
                 self.powerups.remove(pu)
             elif pu.y - pu.h > VIRTUAL_H:
                 self.powerups.remove(pu)
+            else:
+                pu.submit(rq)
+
+        self.printer.submit(rq)
+        self.girl.submit(rq)
+        self.particles.update(world_dt)
 
         # percent win or lose
         if self.progress <= 0:
-            self.result_text = "Level failed, hit 0%"
-            self.state = "GAME_OVER"
+            self.end_level("Level failed, hit 0%")
         elif self.progress >= 100:
-            self.result_text = "Level complete, hit 100%"
-            self.state = "GAME_OVER"
+            self.end_level("Level complete, hit 100%")
 
     # ---------- special level ----------
-    def special_spawn(self):
-        # choose asset from the shared pools
-        good = random.random() < self.level.good_prob
-        file_list = GOOD_ITEM_FILES if good else BAD_ITEM_FILES
-        path = random.choice(file_list) if file_list else ""
+    def special_spawn(self, good: bool, path: str, x: float, vx: float, vy: float):
+        if len(self.special_items) >= self.level.max_items: return
         img = get_item_image(path, self.level.item_size)
-
-        # launch from bottom with a tall arc
-        x = random.uniform(VIRTUAL_W * 0.18, VIRTUAL_W * 0.82)
+        # launch from below the bottom edge with a tall arc
         y = VIRTUAL_H + 40
-        # yeet higher so apex is mid/top screen (gravity ~1400, vy ~ -1400 to -1750)
-        vy = -random.uniform(1350, 1750)
-        vx = random.uniform(-520, 520)
-
-        self.special_items.append(FlyingItem(img, x, y, vx, vy, good))
+        it = FlyingItem(img, good, path)
+        self.special_items.add(it, x, y, vx, vy, radius=it.radius)
+        self.telemetry.event("spawn", good=good, x=round(x), vx=round(vx), vy=round(vy))
 
     def update_playing_special(self, dt):
         # timer
         self.time_left -= dt
         if self.time_left <= 0:
             self.time_left = 0
-            self.result_text = "Time up"
-            self.state = "GAME_OVER"
+            self.end_level("Time up")
             return
+        self.sim_time += dt
 
         # stage change by progress
         self.update_bg_stage(force=False)
-
-        # spawn arcs bursty
-        self.special_spawn_timer += dt * 1000
-        if self.special_spawn_timer >= max(250, self.level.spawn_interval_ms - 100):
-            self.special_spawn_timer = 0
-            for _ in range(random.randint(1, 3)):
-                if len(self.special_items) < self.level.max_items:
-                    self.special_spawn()
-
-        # update items
-        for it in list(self.special_items):
-            it.update(dt)
-            if not it.alive:
-                if it.good and it.y > VIRTUAL_H and self.progress > 0:
-                    self.progress = max(0, self.progress - 1)
-                self.special_items.remove(it)
-
-        # update sliced halves
-        for sp in list(self.special_pieces):
-            sp.update(dt)
-            if not sp.alive:
-                self.special_pieces.remove(sp)
-
-        # record slice path
-        mx, my = mouse_pos_virtual()
-        if pygame.mouse.get_pressed()[0]:
-            self.slice_points.append((mx, my, pygame.time.get_ticks() / 1000.0))
+        rq = self.rq
+        rq.begin()
+        world_dt = dt * self.world_clock.scale
+
+        arcs, pieces = self.special_items, self.special_pieces
+        arcs.advance(world_dt)
+        pieces.advance(world_dt)
+
+        # spawn arcs, bursts come as several rows due at the same time
+        self.schedule.advance(dt)
+        for _, good, path, x, vx, vy in self.schedule.due("special"): self.special_spawn(good, path, x, vx, vy)
+
+        # fell out the bottom: a good item missed costs a point
+        for it in arcs.expire():
+            if it.good and self.progress > 0:
+                self.progress = max(0, self.progress - 1)
+                self.telemetry.event("miss", progress=self.progress)
+        pieces.expire()
+        arcs.evaluate()
+        pieces.evaluate()
+
+        # record slice path from every motion sample since last frame
+        new_stroke, samples = self.swipe.drain()
+        if new_stroke: self.slice_points.clear()
+        self.slice_points.extend(samples)
         # keep last ~0.18s
         now = pygame.time.get_ticks() / 1000.0
-        self.slice_points = [(x, y, t) for (x, y, t) in self.slice_points if now - t <= 0.18]
+        while self.slice_points and now - self.slice_points[0][2] > SLICE_TRAIL_S:
+            self.slice_points.popleft()
 
-        # check slice collisions vs trail segments
+        # check slice collisions vs trail segments, all items against all segments at once
         if len(self.slice_points) >= 2:
-            pts = self.slice_points
-            for it in list(self.special_items):
-                if not it.alive: continue
-                cx, cy, r = it.x, it.y, it.radius
-                sliced = False
-                swipe_dx = 0.0
-                swipe_dy = 0.0
-                for i in range(len(pts) - 1):
-                    x1, y1, _ = pts[i]
-                    x2, y2, _ = pts[i+1]
-                    dx, dy = x2 - x1, y2 - y1
-                    if dx == 0 and dy == 0: continue
-                    # distance from center to segment
-                    tproj = max(0, min(1, ((cx - x1)*dx + (cy - y1)*dy) / (dx*dx + dy*dy)))
-                    px = x1 + tproj * dx
-                    py = y1 + tproj * dy
-                    dist2 = (px - cx)**2 + (py - cy)**2
-                    if dist2 <= (r*r):
-                        sliced = True
-                        swipe_dx, swipe_dy = dx, dy
-                if sliced:
-                    it.alive = False
-                    self.special_items.remove(it)
-                    if it.good:
-                        self.progress = min(100, self.progress + 1)
+            for it, swipe_dx, swipe_dy in arcs.hits(list(self.slice_points)):
+                x, y, vx, vy = arcs.motion(it)
+                arcs.remove(it)
+                if it.good:
+                    self.progress = min(100, self.progress + 1)
+                else:
+                    self.progress = max(0, self.progress - 1)
+                self.telemetry.event("slice", good=it.good, progress=self.progress)
+                juice = pygame.transform.average_color(it.img)[:3] if it.img else (GREEN if it.good else RED)
+                self.particles.emit(x, y, 40, juice, speed=(150, 700), life=(0.3, 0.8))
+
+                if it.img:
+                    w, h = it.img.get_size()
+                    sep = 360
+                    if abs(swipe_dx) >= abs(swipe_dy):
+                        # horizontal swipe → horizontal cut (top/bottom)
+                        top_surf = it.img.subsurface(pygame.Rect(0, 0, w, h // 2)).copy()
+                        bot_surf = it.img.subsurface(pygame.Rect(0, h // 2, w, h - h // 2)).copy()
+                        side = 1 if swipe_dx >= 0 else -1
+                        pieces.add(SlicedPiece(top_surf), x, y - h * 0.25, 120 * side, vy - sep, random.uniform(-220, 220))
+                        pieces.add(SlicedPiece(bot_surf), x, y + h * 0.25, -120 * side, vy + sep, random.uniform(-220, 220))
                     else:
-                        self.progress = max(0, self.progress - 1)
-
-                    if it.img:
-                        w, h = it.img.get_size()
-                        if abs(swipe_dx) >= abs(swipe_dy):
-                            # horizontal swipe → horizontal cut (top/bottom)
-                            top_rect = pygame.Rect(0, 0, w, h // 2)
-                            bot_rect = pygame.Rect(0, h // 2, w, h - h // 2)
-                            top_surf = it.img.subsurface(top_rect).copy()
-                            bot_surf = it.img.subsurface(bot_rect).copy()
-                            top_cx, top_cy = it.x, it.y - h * 0.25
-                            bot_cx, bot_cy = it.x, it.y + h * 0.25
-                            sep = 360
-                            side = 1 if swipe_dx >= 0 else -1
-                            self.special_pieces.append(SlicedPiece(top_surf, top_cx, top_cy, 120 * side, it.vy - sep))
-                            self.special_pieces.append(SlicedPiece(bot_surf, bot_cx, bot_cy, -120 * side, it.vy + sep))
-                        else:
-                            # vertical swipe → vertical cut (left/right)
-                            left_rect  = pygame.Rect(0, 0, w // 2, h)
-                            right_rect = pygame.Rect(w // 2, 0, w - w // 2, h)
-                            left_surf  = it.img.subsurface(left_rect).copy()
-                            right_surf = it.img.subsurface(right_rect).copy()
-                            left_cx, left_cy   = it.x - w * 0.25, it.y
-                            right_cx, right_cy = it.x + w * 0.25, it.y
-                            sep = 360
-                            side = 1 if swipe_dy >= 0 else -1
-                            self.special_pieces.append(SlicedPiece(left_surf,  left_cx,  left_cy,  it.vx - sep,  120 * side))
-                            self.special_pieces.append(SlicedPiece(right_surf, right_cx, right_cy, it.vx + sep, -120 * side))
+                        # vertical swipe → vertical cut (left/right)
+                        left_surf = it.img.subsurface(pygame.Rect(0, 0, w // 2, h)).copy()
+                        right_surf = it.img.subsurface(pygame.Rect(w // 2, 0, w - w // 2, h)).copy()
+                        side = 1 if swipe_dy >= 0 else -1
+                        pieces.add(SlicedPiece(left_surf), x - w * 0.25, y, vx - sep, 120 * side, random.uniform(-220, 220))
+                        pieces.add(SlicedPiece(right_surf), x + w * 0.25, y, vx + sep, -120 * side, random.uniform(-220, 220))
+
+        # submit after slicing so cut items don't show for one more frame
+        for group in (arcs, pieces):
+            for e, x, y, ang in zip(group, *group.frame()): e.submit(rq, x, y, ang)
+        self.particles.update(world_dt)
 
         # win/lose
         if self.progress <= 0:
-            self.result_text = "Level failed, hit 0%"
-            self.state = "GAME_OVER"
+            self.end_level("Level failed, hit 0%")
         elif self.progress >= 100:
-            self.result_text = "Level complete, hit 100%"
-            self.state = "GAME_OVER"
+            self.end_level("Level complete, hit 100%")
 
     # ---------- screens ----------
-    def draw_playing(self, surf):
-        self.draw_background(surf)
-        self.draw_top_bar(surf)
-        self.printer.draw(surf)
-        for it in self.items: it.draw(surf)
-        for pu in self.powerups: pu.draw(surf)
-        self.girl.draw(surf)
-
-        hud = f"Good {self.caught_good}  Bad {self.caught_bad}  Level {self.level.name}"
+    def draw_footer(self, surf, hud: str):
         txt = FONT_SM.render(hud, True, WHITE)
         surf.blit(txt, (24, VIRTUAL_H - 48))
 
         # Quit button
-        back_rect = pygame.Rect(VIRTUAL_W - 160, VIRTUAL_H - 64, 136, 44)
-        pygame.draw.rect(surf, BLACK, back_rect, border_radius=12)
-        draw_text_center("Quit", FONT_MED, WHITE, surf, back_rect.centerx, back_rect.centery)
-        self.handle_click([(back_rect, self.to_level_select)])
-
-    def draw_playing_special(self, surf):
-        self.draw_background(surf)
-        self.draw_top_bar(surf)
+        pygame.draw.rect(surf, BLACK, QUIT_BTN_RECT, border_radius=12)
+        draw_text_center("Quit", FONT_MED, WHITE, surf, QUIT_BTN_RECT.centerx, QUIT_BTN_RECT.centery)
 
-        # flying items
-        for it in self.special_items:
-            it.draw(surf)
-        # sliced halves on top
-        for sp in self.special_pieces:
-            sp.draw(surf)
+    def draw_paused(self, surf):
+        draw_text_center("Paused", FONT_BIG, WHITE, surf, VIRTUAL_W//2, VIRTUAL_H//2)
 
-        # slice trail
+    def draw_slice_trail(self, surf):
         if len(self.slice_points) >= 2:
-            pts = [(int(x), int(y)) for (x, y, _) in self.slice_points]
-            pygame.draw.lines(surf, CYAN, False, pts, 4)
+            k = surf.get_width() / VIRTUAL_W  # split seats draw at their own size
+            pts = [(int(x * k), int(y * k)) for (x, y, _) in self.slice_points]
+            pygame.draw.lines(surf, CYAN, False, pts, max(1, round(4 * k)))
 
-        # footer HUD
-        hud = f"SPECIAL LEVEL"
-        txt = FONT_SM.render(hud, True, WHITE)
-        surf.blit(txt, (24, VIRTUAL_H - 48))
+    # entities were queued by update_playing, this only adds the non-sprite layers
+    def draw_playing(self, surf):
+        rq = self.rq
+        hud = f"Good {self.caught_good}  Bad {self.caught_bad}  Level {self.level.name}"
+        self.submit_background(rq)
+        rq.submit_call(self.particles.draw, LAYER_PARTICLES, gpu=self.particles.draw_gpu)
+        rq.submit_call(self.draw_top_bar, LAYER_HUD, key=self.top_bar_key(), rect=TOP_BAR_RECT)
+        if self.user_paused: rq.submit_call(self.draw_paused, LAYER_HUD, key="Paused", rect=PAUSED_RECT)
+        rq.submit_call(lambda s: self.draw_footer(s, hud), LAYER_HUD, key=hud, rect=FOOTER_RECT)
+        rq.flush(surf)
+        self.handle_click([(QUIT_BTN_RECT, self.to_level_select)])
 
-        # Quit button
-        back_rect = pygame.Rect(VIRTUAL_W - 160, VIRTUAL_H - 64, 136, 44)
-        pygame.draw.rect(surf, BLACK, back_rect, border_radius=12)
-        draw_text_center("Quit", FONT_MED, WHITE, surf, back_rect.centerx, back_rect.centery)
-        self.handle_click([(back_rect, self.to_level_select)])
+    def draw_playing_special(self, surf):
+        rq = self.rq
+        self.submit_background(rq)
+        rq.submit_call(self.particles.draw, LAYER_PARTICLES, gpu=self.particles.draw_gpu)
+        rq.submit_call(self.draw_top_bar, LAYER_HUD, key=self.top_bar_key(), rect=TOP_BAR_RECT)
+        if self.user_paused: rq.submit_call(self.draw_paused, LAYER_HUD, key="Paused", rect=PAUSED_RECT)
+        rq.submit_call(lambda s: self.draw_footer(s, "SPECIAL LEVEL"), LAYER_HUD, key="SPECIAL LEVEL", rect=FOOTER_RECT)
+        rq.submit_call(self.draw_slice_trail, LAYER_TRAIL, key=tuple(self.slice_points))
+        rq.flush(surf)
+        self.handle_click([(QUIT_BTN_RECT, self.to_level_select)])
 
     def to_level_select(self):
         self.state = "LEVEL_SELECT"
         self.items.clear()
         self.powerups.clear()
-        self.active_timers.clear()
-        self._apply_slowmo(False)
-        pygame.mixer.music.stop()
+        self.clear_powerups()
+        self.user_paused = False
+        if self.owns_music: pygame.mixer.music.stop()
         self.special_items.clear()
         self.slice_points.clear()
         self.special_pieces.clear()
+        self.swipe.reset()
+        self.particles.clear()
 
     def to_main_menu(self):
         self.state = "MAIN_MENU"
-        pygame.mixer.music.stop()
+        if self.owns_music: pygame.mixer.music.stop()
 
     def start_level(self, idx):
         self.level_index = idx
         self.level = LEVELS[idx]
+        self.telemetry.event("level_start", level=self.level.name)
         self.reset_level_runtime()
         if self.level.name == "SPECIAL LEVEL":
             self.state = "PLAYING_SPECIAL"
         else:
             self.state = "PLAYING"
+        self.start_snapshot = self.snapshot(rng=False)
+        self.rewind_buf.clear()
+        self.rewind_timer = 0.0
 
     def draw_main_menu(self, surf):
         if MAIN_MENU_BG_IMG:
@@ -1032,8 +2841,14 @@ class Game:
         draw_text_center("Quit", FONT_MED, WHITE, surf, quit_rect.centerx, quit_rect.centery)
         def go_play(): self.state = "LEVEL_SELECT"
         def go_quit(): pygame.quit(); sys.exit(0)
-        self.handle_click([(play_rect, go_play), (quit_rect, go_quit)])
-        draw_text_center("Move with arrows or A D • Hold mouse to slice in SPECIAL LEVEL", FONT_MED, WHITE, surf, VIRTUAL_W//2, VIRTUAL_H - 60)
+        rects = [(play_rect, go_play), (quit_rect, go_quit)]
+        if self.has_resume:
+            resume_rect = pygame.Rect(VIRTUAL_W//2 - 180, VIRTUAL_H//2 + 170, 360, 70)
+            pygame.draw.rect(surf, YELLOW, resume_rect, border_radius=18)
+            draw_text_center("Resume", FONT_MED, BLACK, surf, resume_rect.centerx, resume_rect.centery)
+            rects.append((resume_rect, self.resume_saved))
+        self.handle_click(rects)
+        draw_text_center(f"Move with {self.controls[2]} • Hold mouse to slice in SPECIAL LEVEL", FONT_MED, WHITE, surf, VIRTUAL_W//2, VIRTUAL_H - 60)
 
     def draw_level_select(self, surf):
         surf.fill((18, 20, 28))
@@ -1043,7 +2858,10 @@ class Game:
         draw_text_center("Back", FONT_MED, WHITE, surf, back_rect.centerx, back_rect.centery)
         start_y, gap = 260, 22
         btn_w, btn_h = 1100, 96
-        rects = [(back_rect, self.to_main_menu)]
+        board_rect = pygame.Rect(VIRTUAL_W - 320, 40, 280, 64)
+        pygame.draw.rect(surf, CYAN, board_rect, border_radius=14)
+        draw_text_center("Leaderboard", FONT_MED, BLACK, surf, board_rect.centerx, board_rect.centery)
+        rects = [(back_rect, self.to_main_menu), (board_rect, lambda: self.open_leaderboard(0))]
         for i, lvl in enumerate(LEVELS):
             r = pygame.Rect(VIRTUAL_W//2 - btn_w//2, start_y + i*(btn_h + gap), btn_w, btn_h)
             pygame.draw.rect(surf, YELLOW if lvl.name != "SPECIAL LEVEL" else ORANGE, r, border_radius=18)
@@ -1063,51 +2881,253 @@ class Game:
         pygame.draw.rect(surf, YELLOW, menu_rect, border_radius=18)
         draw_text_center("Retry", FONT_BIG, BLACK, surf, again_rect.centerx, again_rect.centery)
         draw_text_center("Level Select", FONT_BIG, BLACK, surf, menu_rect.centerx, menu_rect.centery)
-        def retry(): self.start_level(self.level_index)
+        board_rect = pygame.Rect(VIRTUAL_W//2 - 160, VIRTUAL_H//2 + 134, 320, 70)
+        pygame.draw.rect(surf, CYAN, board_rect, border_radius=18)
+        draw_text_center("Leaderboard", FONT_MED, BLACK, surf, board_rect.centerx, board_rect.centery)
+        def retry(): self.retry_level()
         def to_menu(): self.state = "LEVEL_SELECT"
-        self.handle_click([(again_rect, retry), (menu_rect, to_menu)])
+        self.handle_click([(again_rect, retry), (menu_rect, to_menu),
+                           (board_rect, lambda: self.open_leaderboard(self.level_index))])
+
+    # ---------- leaderboard ----------
+    def open_leaderboard(self, idx: int):
+        self.board_level = idx % len(LEVELS)
+        self.board_rows = self.runs.top(LEVELS[self.board_level].name)  # queried once, not per frame
+        self.state = "LEADERBOARD"
+
+    def draw_leaderboard(self, surf):
+        surf.fill((16, 18, 26))
+        lvl = LEVELS[self.board_level]
+        draw_text_center(f"Leaderboard • {lvl.name}", FONT_BIG, WHITE, surf, VIRTUAL_W//2, 120)
+        back_rect = pygame.Rect(40, 40, 200, 64)
+        prev_rect = pygame.Rect(VIRTUAL_W//2 - 700, 90, 90, 64)
+        next_rect = pygame.Rect(VIRTUAL_W//2 + 610, 90, 90, 64)
+        for r, label in ((back_rect, "Back"), (prev_rect, "<"), (next_rect, ">")):
+            pygame.draw.rect(surf, GRAY, r, border_radius=14)
+            draw_text_center(label, FONT_MED, WHITE, surf, r.centerx, r.centery)
+        cols = [("#", 360), ("Final", 560), ("Time", 780), ("Good", 980), ("Bad", 1140), ("Power-ups", 1320), ("Date", 1560)]
+        for title, x in cols: draw_text_center(title, FONT_MED, YELLOW, surf, x, 240)
+        if not self.board_rows:
+            draw_text_center("No runs yet", FONT_MED, WHITE, surf, VIRTUAL_W//2, 360)
+        for i, run in enumerate(self.board_rows):
+            y = 310 + i * 64
+            used = sum(json.loads(run["powerups"]).values())
+            cells = [str(i + 1), f"{run['progress']}%", f"{run['duration_s']:.1f}s", str(run["caught_good"]),
+                     str(run["caught_bad"]), str(used), time.strftime("%Y-%m-%d %H:%M", time.localtime(run["ended_at"]))]
+            for (_, x), text in zip(cols, cells): draw_text_center(text, FONT_MED, WHITE, surf, x, y)
+        self.handle_click([(back_rect, self.close_leaderboard),
+                           (prev_rect, lambda: self.open_leaderboard(self.board_level - 1)),
+                           (next_rect, lambda: self.open_leaderboard(self.board_level + 1))])
+
+    def close_leaderboard(self):
+        self.state = "LEVEL_SELECT"
 
     # ---------- main run ----------
-    def run(self):
+    def set_focus(self, focused: bool, minimized: Optional[bool] = None):
+        was_bg = not self.focused or self.minimized
+        self.focused = focused
+        if minimized is not None: self.minimized = minimized
+        is_bg = not self.focused or self.minimized
+        if is_bg and not was_bg:
+            pygame.mixer.music.pause()
+        elif was_bg and not is_bg:
+            if not self.user_paused: pygame.mixer.music.unpause()
+            for s in self.sessions: s.skip_dt = True  # don't replay the time spent in the background
+
+    def in_background(self) -> bool:
+        return not self.focused or self.minimized
+
+    def handle_events(self, events):
         global SCREEN, SCREEN_W, SCREEN_H
+        for e in events:
+            for s in self.sessions: s.swipe.handle_event(e)
+            if e.type == pygame.MOUSEBUTTONDOWN: self.focus_at(screen_to_virtual(*e.pos))
+            elif e.type == pygame.FINGERDOWN: self.focus_at((int(e.x * VIRTUAL_W), int(e.y * VIRTUAL_H)))
+            if e.type == pygame.QUIT:
+                # closing mid-level leaves a resume file for the main menu
+                if self.viewport is None and self.state in ("PLAYING", "PLAYING_SPECIAL"):
+                    self.save_snapshot(RESUME_FILE)
+                pygame.quit(); sys.exit(0)
+            if e.type == pygame.WINDOWFOCUSLOST: self.set_focus(False)
+            elif e.type == pygame.WINDOWFOCUSGAINED: self.set_focus(True)
+            elif e.type == pygame.WINDOWMINIMIZED: self.set_focus(self.focused, True)
+            elif e.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED): self.set_focus(self.focused, False)
+            if e.type == pygame.KEYDOWN:
+                # split screen: a seat's own movement keys give it the focus, menu keys only act there
+                for s in self.sessions:
+                    if s.viewport is not None and (e.key in s.controls[0] or e.key in s.controls[1]):
+                        self.focus = s.index
+                self.sessions[self.focus].handle_key(e.key)
+                if e.key == pygame.K_F9: self.profiler.request()
+                if e.key == pygame.K_F11 and TEXTURES is not None:
+                    # the window keeps its virtual-size renderer, SDL only resizes it
+                    try: pygame.display.toggle_fullscreen()
+                    except pygame.error: pass
+                elif e.key == pygame.K_F11:
+                    flags = SCREEN.get_flags()
+                    if flags & pygame.FULLSCREEN:
+                        SCREEN = set_display_mode((1280, 720), pygame.RESIZABLE)
+                    else:
+                        SCREEN = make_fullscreen()
+                    SCREEN_W, SCREEN_H = SCREEN.get_size()
+
+    def focus_at(self, pos):
+        for s in self.sessions:
+            if s.viewport is not None and s.viewport.collidepoint(pos): self.focus = s.index
+
+    def handle_key(self, key):
+        if key == pygame.K_ESCAPE:
+            if self.state in ("PLAYING", "PLAYING_SPECIAL"):
+                self.state = "LEVEL_SELECT"
+                if self.owns_music: pygame.mixer.music.stop()
+            elif self.state == "LEVEL_SELECT":
+                self.state = "MAIN_MENU"
+            elif self.state in ("GAME_OVER", "LEADERBOARD"):
+                self.state = "LEVEL_SELECT"
+        left, right = self.controls[0], self.controls[1]
+        if self.state == "LEADERBOARD" and (key in left or key in right):
+            self.open_leaderboard(self.board_level + (1 if key in right else -1))
+        if self.state in ("PLAYING", "PLAYING_SPECIAL"):
+            if key == pygame.K_p: self.set_user_paused(not self.user_paused)
+            elif key == pygame.K_BACKSPACE: self.rewind()
+
+    def update_frame(self, dt, paused: bool):
+        if self.skip_dt: dt, self.skip_dt = 0.0, False
+        state = self.drawn_state = self.state
+        if paused or self.user_paused: return
+        if state == "PLAYING": self.update_playing(dt)
+        elif state == "PLAYING_SPECIAL": self.update_playing_special(dt)
+        if self.state == state and state in ("PLAYING", "PLAYING_SPECIAL"): self.record_rewind(dt)
+
+    def draw_frame(self):
+        state, surf = self.drawn_state, self.target
+        menu = state not in ("PLAYING", "PLAYING_SPECIAL") and surf.get_width() != VIRTUAL_W
+        if menu: surf = GAME_SURF  # menus lay out in virtual pixels, scaled into the seat below
+        if state == "MAIN_MENU":
+            self.draw_main_menu(surf)
+        elif state == "LEVEL_SELECT":
+            self.draw_level_select(surf)
+        elif state == "PLAYING":
+            self.draw_playing(surf)
+        elif state == "PLAYING_SPECIAL":
+            self.draw_playing_special(surf)
+        elif state == "GAME_OVER":
+            self.draw_game_over(surf)
+        elif state == "LEADERBOARD":
+            self.draw_leaderboard(surf)
+        if menu: self.target.blit(pygame.transform.scale(surf, self.target.get_size()), (0, 0))
+
+    # split seats draw at the size of their rect on the window (16:9, up to the virtual size)
+    def fit_target(self, size):
+        k = min(size[0] / VIRTUAL_W, size[1] / VIRTUAL_H, 1.0)
+        size = (max(1, round(VIRTUAL_W * k)), max(1, round(VIRTUAL_H * k)))
+        if self.target.get_size() == size: return
+        SPLIT_SURFACES.remove(self.target)
+        self.target = make_opaque_surface(size)
+        SPLIT_SURFACES.append(self.target)
+
+    # each seat's rect on the window, or on the virtual-size renderer with textures
+    def seat_rects(self) -> List[pygame.Rect]:
+        if TEXTURES is not None: return [s.viewport for s in self.sessions]
+        sx, sy = SCREEN_W / VIRTUAL_W, SCREEN_H / VIRTUAL_H
+        rects = []
+        for s in self.sessions:
+            vp = s.viewport
+            x0, y0 = int(vp.x * sx), int(vp.y * sy)
+            rects.append(pygame.Rect(x0, y0, int(vp.right * sx) - x0, int(vp.bottom * sy) - y0))
+        return rects
+
+    # One present per frame, however many sessions. Split seats already match their rect,
+    # so they are blitted as they are, or streamed up as one texture each.
+    def present(self):
+        if self.viewport is None:
+            if TEXTURES is not None:
+                TEXTURES.present(GAME_SURF)
+            else:
+                pygame.transform.smoothscale(GAME_SURF, (SCREEN_W, SCREEN_H), SCREEN)
+                pygame.display.flip()
+            return
+        seats = list(zip(self.sessions, self.seat_rects()))
+        target = self.sessions[self.focus].target
+        pygame.draw.rect(target, WHITE, target.get_rect(), 3)
+        if TEXTURES is not None:
+            TEXTURES.present_seats([(s.target, r) for s, r in seats])
+            return
+        if len(seats) in (2, 3): SCREEN.fill(BLACK)  # letterbox / empty cell
+        for s, r in seats:
+            if s.target.get_size() == r.size: SCREEN.blit(s.target, r)
+            else: pygame.transform.scale(s.target, r.size, SCREEN.subsurface(r))  # window above 1080p
+        pygame.display.flip()
+
+    def render_frame(self, dt):
+        # gameplay is paused while the window is in the background
+        paused = self.in_background()
+        state = self.state
+        t0 = time.perf_counter()
+        for s in self.sessions: s.update_frame(dt, paused)
+        t1 = time.perf_counter()
+        if TEXTURES is not None: TEXTURES.begin()
+        if self.viewport is not None:
+            for s, r in zip(self.sessions, self.seat_rects()): s.fit_target(r.size)
+        for s in self.sessions: s.draw_frame()
+        t2 = time.perf_counter()
+        self.present()
+        t3 = time.perf_counter()
+        self.frame_ms.append((t3 - t0) * 1000)
+        self.telemetry.event("frame", state=state, dt_ms=round(dt * 1000, 2), update_ms=round((t1 - t0) * 1000, 2),
+                             draw_ms=round((t2 - t1) * 1000, 2), present_ms=round((t3 - t2) * 1000, 2))
+
+    def collect_stats(self) -> dict:
+        pace = self.pacer.stats()
+        work = sorted(self.frame_ms)
+        pct = lambda q: round(work[min(len(work) - 1, int(len(work) * q))], 3) if work else None
+        return {
+            "time": round(time.time(), 3), "state": self.state, "level": self.level.name,
+            "fps": round(1000.0 / pace["mean_ms"], 2) if pace.get("mean_ms") else 0.0,
+            "frame_interval_ms": {k: round(pace[k], 3) for k in ("mean_ms", "jitter_ms", "p99_ms", "max_ms") if k in pace},
+            "frame_work_ms": {"p50": pct(0.5), "p90": pct(0.9), "p99": pct(0.99), "max": pct(1.0)},
+            "missed_frames": pace["missed"], "pacer": pace["mode"], "target_fps": pace["fps"],
+            "sessions": [{"state": s.state, "level": s.level.name, "progress": s.progress} for s in self.sessions],
+            "entities": {"items": sum(len(s.items) for s in self.sessions),
+                         "powerups": sum(len(s.powerups) for s in self.sessions),
+                         "special_items": sum(len(s.special_items) for s in self.sessions),
+                         "special_pieces": sum(len(s.special_pieces) for s in self.sessions),
+                         "particles": sum(s.particles.n for s in self.sessions)},
+            "overlay_uploads": TEXTURES.overlay_uploads if TEXTURES is not None else None,
+            "caches": {name: round(h / (h + m), 4) if h + m else None for name, (h, m) in CACHE_STATS.items()},
+            "bg_build_ms": {"load": self.bg.build_ms, "blends": round(self.bg.blend_ms, 2)},
+            "memory": dict(memory_usage(), backgrounds=self.bg.stats()),
+            "telemetry": self.telemetry.stats(),
+        }
+
+    def publish_stats(self):
+        if not self.stats_server.enabled: return
+        now = time.perf_counter()
+        if now < self.stats_next: return
+        self.stats_next = now + STATS_PUBLISH_S
+        self.stats_server.publish(self.collect_stats())
+
+    def run(self):
+        self.pacer.resync()
         while True:
-            dt = CLOCK.tick(FPS) / 1000.0
+            dt = self.pacer.wait(BACKGROUND_FPS if self.in_background() else None)
+            self.publish_stats()
             events = pygame.event.get()
-            for e in events:
-                if e.type == pygame.QUIT:
-                    pygame.quit(); sys.exit(0)
-                if e.type == pygame.KEYDOWN:
-                    if e.key == pygame.K_ESCAPE:
-                        if self.state in ("PLAYING", "PLAYING_SPECIAL"):
-                            self.state = "LEVEL_SELECT"; pygame.mixer.music.stop()
-                        elif self.state == "LEVEL_SELECT":
-                            self.state = "MAIN_MENU"
-                        elif self.state == "GAME_OVER":
-                            self.state = "LEVEL_SELECT"
-                    if e.key == pygame.K_F11:
-                        flags = SCREEN.get_flags()
-                        if flags & pygame.FULLSCREEN:
-                            SCREEN = pygame.display.set_mode((1280, 720), pygame.RESIZABLE)
-                        else:
-                            SCREEN = make_fullscreen()
-                        SCREEN_W, SCREEN_H = SCREEN.get_size()
-
-            GAME_SURF.fill((0, 0, 0, 0))
-            if self.state == "MAIN_MENU":
-                self.draw_main_menu(GAME_SURF)
-            elif self.state == "LEVEL_SELECT":
-                self.draw_level_select(GAME_SURF)
-            elif self.state == "PLAYING":
-                self.update_playing(dt)
-                self.draw_playing(GAME_SURF)
-            elif self.state == "PLAYING_SPECIAL":
-                self.update_playing_special(dt)
-                self.draw_playing_special(GAME_SURF)
-            elif self.state == "GAME_OVER":
-                self.draw_game_over(GAME_SURF)
-
-            pygame.transform.smoothscale(GAME_SURF, (SCREEN_W, SCREEN_H), SCREEN)
-            pygame.display.flip()
+            static = self.in_background() or all(s.user_paused or s.state in IDLE_STATES for s in self.sessions)
+            if not events and static and all(s.state == s.drawn_state for s in self.sessions):
+                # nothing can change on screen until input arrives, so sleep instead of redrawing
+                e = pygame.event.wait(IDLE_WAIT_MS)
+                self.pacer.resync()
+                if e.type == pygame.NOEVENT: continue
+                events = [e] + pygame.event.get()
+            self.handle_events(events)
+            if self.minimized: continue
+            self.profiler.begin_frame(self.level.name if self.state in ("PLAYING", "PLAYING_SPECIAL") else self.state)
+            self.render_frame(dt)
+            path = self.profiler.end_frame()
+            if path:
+                self.telemetry.event("profile", path=path, frames=self.profiler.frames)
+                self.pacer.resync()  # writing the capture shouldn't count as a missed frame
 
 # --------------------- PowerUpDrop (kept same spot to avoid renaming) ---------------------
 class PowerUpDrop:
@@ -1116,29 +3136,33 @@ class PowerUpDrop:
         self.x, self.y, self.vy = x, y, vy
         self.kind = kind
         self.w, self.h = 44, 44
-        self.icon = load_image(POWERUP_ICONS.get(kind, ""), self.ICON_SIZE)
+        pu = POWERUPS.get(kind)
+        self.icon = get_item_image(pu.icon if pu else "", self.ICON_SIZE)
+        if self.icon:
+            self.sprite = self.icon
+            self.off_x = (self.w - self.ICON_SIZE[0])//2
+            self.off_y = (self.h - self.ICON_SIZE[1])//2
+        else:
+            self.sprite = fallback_powerup_image(kind, (self.w, self.h))
+            self.off_x = self.off_y = 0
 
     def update(self, dt): self.y += self.vy * dt
     def rect(self): return pygame.Rect(int(self.x - self.w//2), int(self.y - self.h//2), self.w, self.h)
 
-    def draw(self, surf):
-        r = self.rect()
-        if self.icon:
-            surf.blit(self.icon, (r.x + (r.w - self.ICON_SIZE[0])//2, r.y + (r.h - self.ICON_SIZE[1])//2))
-        else:
-            col = {
-                PU_MORE_TIME: GREEN, PU_LESS_TIME: RED, PU_BIGGER_BASKET: GOLD,
-                PU_LESS_PCT: MAGENTA, PU_MORE_PCT: CYAN, PU_DOUBLE_PCT: ORANGE,
-                PU_MAGNET: (100, 200, 255), PU_STOPWATCH: PURPLE
-            }.get(self.kind, YELLOW)
-            pygame.draw.rect(surf, col, r, border_radius=10)
-            short = {
-                PU_MORE_TIME: "+5s", PU_LESS_TIME: "-5s", PU_BIGGER_BASKET: "B",
-                PU_LESS_PCT: "-2%", PU_MORE_PCT: "+5%", PU_DOUBLE_PCT: "x2",
-                PU_MAGNET: "M", PU_STOPWATCH: "S"
-            }.get(self.kind, "?")
-            draw_text_center(short, FONT_TINY, BLACK, surf, r.centerx, r.centery)
+    def submit(self, rq: RenderQueue):
+        rq.submit(self.sprite, (int(self.x - self.w//2) + self.off_x, int(self.y - self.h//2) + self.off_y), LAYER_POWERUPS)
 
 # --------------------- entry ---------------------
 if __name__ == "__main__":
+    if OFFLINE:
+        # python NEW.py --spawns LEVEL [SEED]: dump a level's spawn timeline as JSON lines
+        try:
+            idx, seed = int(sys.argv[2]), int(sys.argv[3]) if len(sys.argv) > 3 else 0
+            if not 0 <= idx < len(LEVELS) or len(sys.argv) > 4: raise ValueError
+        except (IndexError, ValueError):
+            print(f"usage: {sys.argv[0]} --spawns LEVEL [SEED]  (LEVEL 0-{len(LEVELS) - 1})", file=sys.stderr)
+            sys.exit(2)
+        sched = SpawnSchedule(LEVELS[idx], seed)
+        for row in sched.preview(): print(json.dumps(row))
+        sys.exit(0)
     Game().run()